@@ -1,49 +1,249 @@
 # ai_alpha_beta.py
-from utils import get_empty_cells, check_winner
+from utils import to_bitboard, iter_bits, DEFAULT_LINES
+from search_board import SearchBoard, default_proximity
+from transposition import get_table, piece_keys, zobrist_hash, ZOBRIST_SIDE, EXACT, LOWER, UPPER
+from symmetry import canonical_hash, transform_bits, unique_moves, INVERSE
+from search_control import SearchLimits, iterative_deepening
+from evaluation import WIN_SCORE
+from tablebase import TABLEBASE_EMPTY, solved_move, probe_score
+from quiescence import QUIESCENCE_NODE_LIMIT, quiescence
+from move_ordering import MoveOrderer, static_order
 MAX_DEPTH = 3
 
-def get_best_move_alpha_beta(board, player):
-    def alphabeta(board, depth, alpha, beta, maximizing):
-        opponent = "X" if player == "O" else "O"
+# Counters from the most recent call, for benchmarks and tuning
+last_search_stats = {}
 
-        if check_winner(board, player):
-            return 1
-        elif check_winner(board, opponent):
-            return -1
-        elif not get_empty_cells(board) or depth >= MAX_DEPTH:
+def get_best_move_alpha_beta(board, player, time_limit_ms=None, node_limit=None, move_ordering=True,
+                             root_moves=None, root_alpha=-float("inf"), stop_event=None,
+                             progress=None, proximity=None,
+                             quiescence_limit=QUIESCENCE_NODE_LIMIT):
+    """
+    Best move for player. Without limits this is a fixed MAX_DEPTH search;
+    with a time and/or node budget it deepens iteratively and returns the
+    best move of the last depth it completed. A stop_event alone deepens
+    the same way, up to MAX_DEPTH.
+    move_ordering=False searches cells in plain row-major order, for comparison.
+    root_moves/root_alpha restrict the root to the given cells and start it
+    with a lower bound; parallel_search uses them to split the root.
+    stop_event aborts the search from another thread and progress(depth, nodes)
+    is called after each completed depth (see SearchLimits).
+    proximity only searches cells that many rows and columns from a stone
+    (see SearchBoard); None uses default_proximity for the board and 0
+    searches every cell.
+    Past the horizon, forcing moves (wins and single blocks) are followed
+    for up to quiescence_limit plies; 0 stops at the static score.
+    """
+    opponent = "X" if player == "O" else "O"
+    bitboard = to_bitboard(board)
+    lines = bitboard.lines
+    # The tablebase only covers the standard 5x5 game
+    tablebase_empty = TABLEBASE_EMPTY if lines is DEFAULT_LINES else -1
+    table = get_table("alpha_beta")
+    table.new_search()
+    limits = SearchLimits(time_limit_ms, node_limit, stop_event, progress)
+    orderer = MoveOrderer(lines=lines) if move_ordering else None
+    cutoffs = 0
+    completed_depth = None
+    tt_hits = table.hits
+    qnodes = 0
+    own_keys = piece_keys(player)
+    other_keys = piece_keys(opponent)
+
+    def horizon_score(depth, side):
+        """Score for side 0 at the horizon when side is to move"""
+        nonlocal qnodes
+        if not quiescence_limit:
+            return position.score
+        score, blocks = quiescence(position, depth, side, quiescence_limit)
+        qnodes += blocks
+        return -score if side else score
+
+    def alphabeta(key, depth, alpha, beta, maximizing):
+        nonlocal cutoffs
+        limits.count_node()
+        # Wins are detected by the parent when it makes the move. With no
+        # live line left (including a full board) the game is a draw.
+        if not position.live_lines:
             return 0
+        if position.empty_count <= tablebase_empty:
+            # Exact if solved; probe_score is for the side to move, scores here for side 0
+            if maximizing:
+                known = probe_score(position.bits[0], position.bits[1], depth)
+            else:
+                known = probe_score(position.bits[1], position.bits[0], depth)
+                known = None if known is None else -known
+            if known is not None:
+                return known
+        # Cells on dead lines only can't change the result
+        candidates = position.moves()
+        remaining = horizon - depth
+        if remaining <= 0:
+            return horizon_score(depth, 0 if maximizing else 1)
+
+        # Values are cached for the side to move; minimizing nodes are the opponent's
+        sign = 1 if maximizing else -1
+        entry = table.probe(key, sign, depth)
+        hash_move = None
+        if entry is not None and entry[0] >= remaining:
+            _, value, flag, hash_move = entry
+            if flag == EXACT:
+                return value
+            elif flag == LOWER:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if beta <= alpha:
+                return value
+        elif entry is not None:
+            hash_move = entry[3]
+        alpha_orig, beta_orig = alpha, beta
+        best_bit = None
+        side = 0 if maximizing else 1
+        if orderer is not None:
+            moves = orderer.order(candidates, depth, side, hash_move)
+        else:
+            moves = iter_bits(candidates)
 
         if maximizing:
             max_eval = -float("inf")
-            for row, col in get_empty_cells(board):
-                board[row][col] = player
-                eval = alphabeta(board, depth + 1, alpha, beta, False)
-                board[row][col] = " "
-                max_eval = max(max_eval, eval)
+            for bit in moves:
+                if position.make_move(bit, 0):
+                    eval = WIN_SCORE - depth - 1
+                else:
+                    eval = alphabeta(key ^ own_keys[bit] ^ ZOBRIST_SIDE, depth + 1, alpha, beta, False)
+                position.unmake_move(bit, 0)
+                if eval > max_eval:
+                    max_eval = eval
+                    best_bit = bit
                 alpha = max(alpha, eval)
                 if beta <= alpha:
+                    cutoffs += 1
+                    if orderer is not None:
+                        orderer.record_cutoff(bit, depth, side, remaining)
                     break
-            return max_eval
+            result = max_eval
         else:
             min_eval = float("inf")
-            for row, col in get_empty_cells(board):
-                board[row][col] = opponent
-                eval = alphabeta(board, depth + 1, alpha, beta, True)
-                board[row][col] = " "
-                min_eval = min(min_eval, eval)
+            for bit in moves:
+                if position.make_move(bit, 1):
+                    eval = depth + 1 - WIN_SCORE
+                else:
+                    eval = alphabeta(key ^ other_keys[bit] ^ ZOBRIST_SIDE, depth + 1, alpha, beta, True)
+                position.unmake_move(bit, 1)
+                if eval < min_eval:
+                    min_eval = eval
+                    best_bit = bit
                 beta = min(beta, eval)
                 if beta <= alpha:
+                    cutoffs += 1
+                    if orderer is not None:
+                        orderer.record_cutoff(bit, depth, side, remaining)
                     break
-            return min_eval
-
-    best_score = -float("inf")
-    best_move = None
-    for row, col in get_empty_cells(board):
-        board[row][col] = player
-        score = alphabeta(board, 0, -float("inf"), float("inf"), False)
-        board[row][col] = " "
-        if score > best_score:
-            best_score = score
-            best_move = (row, col)
-
-    return best_move
+            result = min_eval
+
+        if result <= alpha_orig:
+            flag = UPPER
+        elif result >= beta_orig:
+            flag = LOWER
+        else:
+            flag = EXACT
+        table.store(key, remaining, result, flag, best_bit, sign, depth)
+        return result
+
+    own = bitboard.bits(player)
+    other = bitboard.bits(opponent)
+    plain_key = zobrist_hash(bitboard.x, bitboard.o, player, lines)
+    empty = lines.full_mask & ~(own | other)
+    if proximity is None:
+        proximity = default_proximity(lines)
+    position = SearchBoard(own, other, lines, proximity)
+    # Late in the game the position is solved outright
+    if root_moves is None and position.live_lines and position.empty_count <= tablebase_empty:
+        move, _ = solved_move(own, other)
+        last_search_stats.clear()
+        last_search_stats.update({
+            "score": probe_score(own, other, -1),
+            "nodes": 0,
+            "cutoffs": 0,
+            "depth": None,
+            "qnodes": 0,
+            "tt_hits": 0,
+            "elapsed": limits.elapsed(),
+        })
+        return move
+    # On a dead draw every move is equal; otherwise skip cells on dead lines only
+    root_cells = position.moves() or empty
+    # Searching a subset of the root is only part of an answer, so it is
+    # neither read from nor written to the root cache
+    partial_root = root_moves is not None
+    if partial_root:
+        root_moves = [lines.cell_bit(row, col) for row, col in root_moves]
+    else:
+        # Moves that give mirror-image positions have the same score; search one
+        root_moves = unique_moves(own, other, iter_bits(root_cells), lines.size)
+    if not root_moves:
+        return None
+    if move_ordering and not partial_root:
+        root_moves = static_order(root_moves, lines)
+
+    # The root result is cached under the canonical (symmetry-reduced) position,
+    # so mirrored boards reuse it with the move mapped back to this orientation
+    root_key, transform = canonical_hash(bitboard.x, bitboard.o, player, lines)
+
+    def search_root(max_depth):
+        nonlocal horizon, completed_depth
+        horizon = max_depth
+        entry = None if partial_root else table.probe(root_key)
+        if entry is not None and entry[0] > max_depth and entry[2] == EXACT and entry[3] is not None:
+            completed_depth = max_depth
+            return transform_bits(entry[3], INVERSE[transform], lines.size), entry[1]
+
+        best_score = -float("inf")
+        best_bit = None
+        for bit in root_moves:
+            if position.make_move(bit, 0):
+                score = WIN_SCORE
+            else:
+                # Only a strictly better score matters, so the best so far is alpha
+                score = alphabeta(plain_key ^ own_keys[bit] ^ ZOBRIST_SIDE,
+                                  0, max(best_score, root_alpha), float("inf"), False)
+            position.unmake_move(bit, 0)
+            if score > best_score:
+                best_score = score
+                best_bit = bit
+
+        # The next iteration starts from this depth's best move
+        if move_ordering:
+            root_moves.remove(best_bit)
+            root_moves.insert(0, best_bit)
+
+        if not partial_root:
+            table.store(root_key, max_depth + 1, best_score, EXACT,
+                        transform_bits(best_bit, transform, lines.size))
+        completed_depth = max_depth
+        return best_bit, best_score
+
+    horizon = MAX_DEPTH
+    if not limits.interruptible:
+        best_bit, best_score = search_root(MAX_DEPTH)
+    else:
+        # Searching past the last empty cell gains nothing; with only a
+        # stop_event the search deepens no further than the fixed MAX_DEPTH
+        max_depth = bin(empty).count("1") - 1
+        if not limits.bounded:
+            max_depth = min(max_depth, MAX_DEPTH)
+        best_bit, best_score = iterative_deepening(search_root, max_depth, limits)
+        if best_bit is None:
+            best_bit = root_moves[0]
+
+    last_search_stats.clear()
+    last_search_stats.update({
+        "score": best_score,
+        "nodes": limits.nodes,
+        "cutoffs": cutoffs,
+        "depth": completed_depth,
+        "qnodes": qnodes,
+        "tt_hits": table.hits - tt_hits,
+        "elapsed": limits.elapsed(),
+    })
+    return lines.bit_to_cell(best_bit)
@@ -0,0 +1,175 @@
+# ai_mcts.py
+import math
+import random
+import numpy as np
+from utils import to_bitboard, iter_bits, DEFAULT_LINES
+from search_control import SearchLimits, SearchTimeout
+from playout_simulator import playout_rewards
+
+# UCT exploration constant; sqrt(2) is the textbook value for rewards in [0, 1]
+EXPLORATION = 1.4
+# Iteration budget when neither a time limit nor an iteration count is given
+DEFAULT_ITERATIONS = 2000
+# Random playouts run from every new leaf; their results are backed up as one batch
+PLAYOUT_BATCH = 8
+# From this batch size on, playouts run on the NumPy simulator, which only
+# beats plain Python once it has enough boards to play at a time
+VECTOR_BATCH = 32
+# Iterations between progress reports
+_PROGRESS_INTERVAL = 256
+
+# Counters from the most recent call, for benchmarks and tuning
+last_search_stats = {}
+
+
+def _moves(mover, waiting, lines=DEFAULT_LINES):
+    """Empty cells on live lines; none left means the game is a draw"""
+    return lines.full_mask & ~(mover | waiting) & lines.live_cells(mover, waiting)
+
+
+def _playout(mover, waiting, rng, lines=DEFAULT_LINES):
+    """
+    Finish the game with random moves, mover first. Returns the result for
+    the other side (the one that moved last): 1 win, 0.5 draw, 0 loss.
+    """
+    reward_if_mover_wins = 0.0
+    while True:
+        moves = _moves(mover, waiting, lines)
+        if not moves:
+            return 0.5
+        bit = rng.choice(list(iter_bits(moves)))
+        mover |= bit
+        if lines.completes_line(mover, bit):
+            return reward_if_mover_wins
+        mover, waiting = waiting, mover
+        reward_if_mover_wins = 1.0 - reward_if_mover_wins
+
+
+class _Node:
+    """
+    One position in the tree. reward sums the playout results, over visits
+    playouts, for the player who made move. terminal is that player's result
+    if the move ended the game, else None.
+    """
+
+    __slots__ = ("move", "parent", "children", "untried", "visits", "reward", "terminal")
+
+    def __init__(self, move, parent, untried, terminal=None):
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.untried = untried
+        self.visits = 0
+        self.reward = 0.0
+        self.terminal = terminal
+
+    def select_child(self, exploration):
+        log_visits = math.log(self.visits)
+        return max(self.children, key=lambda child: child.reward / child.visits
+                   + exploration * math.sqrt(log_visits / child.visits))
+
+
+def get_best_move_mcts(board, player, time_limit_ms=None, iterations=None, stop_event=None,
+                       progress=None, exploration=EXPLORATION, batch=PLAYOUT_BATCH, seed=None):
+    """
+    Monte Carlo Tree Search with UCT selection. Each iteration walks down the
+    tree, adds one new position and scores it with a batch of random games;
+    batches of VECTOR_BATCH or more run on the NumPy playout simulator.
+    Runs until time_limit_ms or the iteration budget is used up
+    (DEFAULT_ITERATIONS without either) and plays the most visited move.
+    progress(depth, iterations) is called every few hundred iterations with
+    the deepest line in the tree.
+    """
+    opponent = "X" if player == "O" else "O"
+    bitboard = to_bitboard(board)
+    lines = bitboard.lines
+    own = bitboard.bits(player)
+    other = bitboard.bits(opponent)
+    empty = lines.full_mask & ~(own | other)
+    rng = random.Random(seed)
+    vector_rng = np.random.default_rng(seed) if batch >= VECTOR_BATCH else None
+    if iterations is None and time_limit_ms is None:
+        iterations = DEFAULT_ITERATIONS
+    limits = SearchLimits(time_limit_ms, iterations, stop_event, progress)
+
+    # On a dead draw every move is equal; otherwise skip cells on dead lines only
+    root_cells = _moves(own, other, lines) or empty
+    if not root_cells:
+        return None
+    root = _Node(None, None, list(iter_bits(root_cells)))
+    max_depth = 0
+    playouts = 0
+
+    try:
+        while True:
+            limits.count_node()
+            limits.check_clock()
+            node = root
+            mover, waiting = own, other
+            depth = 0
+
+            # Selection: follow UCT through fully expanded nodes
+            while not node.untried and node.children and node.terminal is None:
+                node = node.select_child(exploration)
+                mover, waiting = waiting, mover | node.move
+                depth += 1
+
+            # Expansion: add one untried move
+            if node.untried and node.terminal is None:
+                bit = node.untried.pop(rng.randrange(len(node.untried)))
+                mover |= bit
+                if lines.completes_line(mover, bit):
+                    child = _Node(bit, node, [], terminal=1.0)
+                else:
+                    moves = _moves(waiting, mover, lines)
+                    child = _Node(bit, node, list(iter_bits(moves)), None if moves else 0.5)
+                node.children.append(child)
+                node = child
+                mover, waiting = waiting, mover
+                depth += 1
+            max_depth = max(max_depth, depth)
+
+            # Simulation, in one batch per leaf
+            if node.terminal is not None:
+                reward = node.terminal * batch
+            elif vector_rng is not None:
+                mover_player = player if depth % 2 == 0 else opponent
+                reward = playout_rewards(mover, waiting, mover_player, batch, vector_rng, lines)
+                playouts += batch
+            else:
+                reward = sum(_playout(mover, waiting, rng, lines) for _ in range(batch))
+                playouts += batch
+
+            # Backpropagation, switching sides at every level
+            while node is not None:
+                node.visits += batch
+                node.reward += reward
+                reward = batch - reward
+                node = node.parent
+
+            if progress is not None and limits.nodes % _PROGRESS_INTERVAL == 0:
+                progress(max_depth, limits.nodes)
+    except SearchTimeout:
+        pass
+
+    if root.children:
+        best = max(root.children, key=lambda child: child.visits)
+        best_bit = best.move
+        score = best.reward / best.visits
+    else:
+        best_bit = next(iter_bits(root_cells))
+        score = None
+
+    completed = limits.nodes - 1  # the last count_node raised instead of running
+    elapsed = limits.elapsed()
+    last_search_stats.clear()
+    last_search_stats.update({
+        "score": score,
+        "nodes": completed,
+        "iterations": completed,
+        "playouts": playouts,
+        "iterations_per_sec": completed / elapsed if elapsed else 0.0,
+        "depth": max_depth,
+        "elapsed": elapsed,
+    })
+    return lines.bit_to_cell(best_bit)
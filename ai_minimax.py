@@ -1,43 +1,190 @@
 # ai_minimax.py
-from utils import get_empty_cells, check_winner
+from utils import to_bitboard, iter_bits, DEFAULT_LINES
+from search_board import SearchBoard, default_proximity
+from transposition import get_table, piece_keys, zobrist_hash, ZOBRIST_SIDE, EXACT
+from symmetry import canonical_hash, transform_bits, unique_moves, INVERSE
+from search_control import SearchLimits, iterative_deepening
+from evaluation import WIN_SCORE
+from tablebase import TABLEBASE_EMPTY, solved_move, probe_score
+from quiescence import QUIESCENCE_NODE_LIMIT, quiescence
 MAX_DEPTH =3
 
-def get_best_move_minimax(board, player):
-    def minimax(board, depth, is_maximizing):
-        opponent = "X" if player == "O" else "O"
+# Counters from the most recent call, for benchmarks and tuning
+last_search_stats = {}
 
-        if check_winner(board, player):
-            return 1
-        elif check_winner(board, opponent):
-            return -1
-        elif not get_empty_cells(board) or depth >= MAX_DEPTH:
+def get_best_move_minimax(board, player, time_limit_ms=None, node_limit=None, root_moves=None,
+                          stop_event=None, progress=None, proximity=None,
+                          quiescence_limit=QUIESCENCE_NODE_LIMIT):
+    """
+    Best move for player. Without limits this is a fixed MAX_DEPTH search;
+    with a time and/or node budget it deepens iteratively and returns the
+    best move of the last depth it completed. A stop_event alone deepens
+    the same way, up to MAX_DEPTH.
+    root_moves restricts the root to the given cells; parallel_search uses it
+    to split the root.
+    stop_event aborts the search from another thread and progress(depth, nodes)
+    is called after each completed depth (see SearchLimits).
+    proximity only searches cells that many rows and columns from a stone
+    (see SearchBoard); None uses default_proximity for the board and 0
+    searches every cell.
+    Past the horizon, forcing moves (wins and single blocks) are followed
+    for up to quiescence_limit plies; 0 stops at the static score.
+    """
+    opponent = "X" if player == "O" else "O"
+    bitboard = to_bitboard(board)
+    lines = bitboard.lines
+    # The tablebase only covers the standard 5x5 game
+    tablebase_empty = TABLEBASE_EMPTY if lines is DEFAULT_LINES else -1
+    table = get_table("minimax")
+    table.new_search()
+    limits = SearchLimits(time_limit_ms, node_limit, stop_event, progress)
+    completed_depth = None
+    tt_hits = table.hits
+    qnodes = 0
+    own_keys = piece_keys(player)
+    other_keys = piece_keys(opponent)
+
+    def horizon_score(depth, side):
+        """Score for side 0 at the horizon when side is to move"""
+        nonlocal qnodes
+        if not quiescence_limit:
+            return position.score
+        score, blocks = quiescence(position, depth, side, quiescence_limit)
+        qnodes += blocks
+        return -score if side else score
+
+    def minimax(key, depth, is_maximizing):
+        limits.count_node()
+        # Wins are detected by the parent when it makes the move. With no
+        # live line left (including a full board) the game is a draw.
+        if not position.live_lines:
             return 0
+        if position.empty_count <= tablebase_empty:
+            # Exact if solved; probe_score is for the side to move, scores here for side 0
+            if is_maximizing:
+                known = probe_score(position.bits[0], position.bits[1], depth)
+            else:
+                known = probe_score(position.bits[1], position.bits[0], depth)
+                known = None if known is None else -known
+            if known is not None:
+                return known
+        # Cells on dead lines only can't change the result
+        candidates = position.moves()
+        remaining = horizon - depth
+        if remaining <= 0:
+            return horizon_score(depth, 0 if is_maximizing else 1)
+
+        # Values are cached for the side to move; minimizing nodes are the opponent's
+        sign = 1 if is_maximizing else -1
+        entry = table.probe(key, sign, depth)
+        if entry is not None and entry[0] >= remaining and entry[2] == EXACT:
+            return entry[1]
 
         if is_maximizing:
             best = -float("inf")
-            for row, col in get_empty_cells(board):
-                board[row][col] = player
-                val = minimax(board, depth + 1, False)
-                board[row][col] = " "
+            for bit in iter_bits(candidates):
+                if position.make_move(bit, 0):
+                    val = WIN_SCORE - depth - 1
+                else:
+                    val = minimax(key ^ own_keys[bit] ^ ZOBRIST_SIDE, depth + 1, False)
+                position.unmake_move(bit, 0)
                 best = max(best, val)
-            return best
         else:
             best = float("inf")
-            for row, col in get_empty_cells(board):
-                board[row][col] = opponent
-                val = minimax(board, depth + 1, True)
-                board[row][col] = " "
+            for bit in iter_bits(candidates):
+                if position.make_move(bit, 1):
+                    val = depth + 1 - WIN_SCORE
+                else:
+                    val = minimax(key ^ other_keys[bit] ^ ZOBRIST_SIDE, depth + 1, True)
+                position.unmake_move(bit, 1)
                 best = min(best, val)
-            return best
-
-    best_score = -float("inf")
-    best_move = None
-    for row, col in get_empty_cells(board):
-        board[row][col] = player
-        score = minimax(board, 0, False)
-        board[row][col] = " "
-        if score > best_score:
-            best_score = score
-            best_move = (row, col)
-
-    return best_move
+
+        table.store(key, remaining, best, EXACT, sign=sign, ply=depth)
+        return best
+
+    own = bitboard.bits(player)
+    other = bitboard.bits(opponent)
+    plain_key = zobrist_hash(bitboard.x, bitboard.o, player, lines)
+    empty = lines.full_mask & ~(own | other)
+    if proximity is None:
+        proximity = default_proximity(lines)
+    position = SearchBoard(own, other, lines, proximity)
+    # Late in the game the position is solved outright
+    if root_moves is None and position.live_lines and position.empty_count <= tablebase_empty:
+        move, _ = solved_move(own, other)
+        last_search_stats.clear()
+        last_search_stats.update({
+            "score": probe_score(own, other, -1),
+            "nodes": 0,
+            "depth": None,
+            "qnodes": 0,
+            "tt_hits": 0,
+            "elapsed": limits.elapsed(),
+        })
+        return move
+    # On a dead draw every move is equal; otherwise skip cells on dead lines only
+    root_cells = position.moves() or empty
+    # Searching a subset of the root is only part of an answer, so it is
+    # neither read from nor written to the root cache
+    partial_root = root_moves is not None
+    if partial_root:
+        root_moves = [lines.cell_bit(row, col) for row, col in root_moves]
+    else:
+        # Moves that give mirror-image positions have the same score; search one
+        root_moves = unique_moves(own, other, iter_bits(root_cells), lines.size)
+    if not root_moves:
+        return None
+
+    # The root result is cached under the canonical (symmetry-reduced) position,
+    # so mirrored boards reuse it with the move mapped back to this orientation
+    root_key, transform = canonical_hash(bitboard.x, bitboard.o, player, lines)
+
+    def search_root(max_depth):
+        nonlocal horizon, completed_depth
+        horizon = max_depth
+        entry = None if partial_root else table.probe(root_key)
+        if entry is not None and entry[0] > max_depth and entry[2] == EXACT and entry[3] is not None:
+            completed_depth = max_depth
+            return transform_bits(entry[3], INVERSE[transform], lines.size), entry[1]
+
+        best_score = -float("inf")
+        best_bit = None
+        for bit in root_moves:
+            if position.make_move(bit, 0):
+                score = WIN_SCORE
+            else:
+                score = minimax(plain_key ^ own_keys[bit] ^ ZOBRIST_SIDE, 0, False)
+            position.unmake_move(bit, 0)
+            if score > best_score:
+                best_score = score
+                best_bit = bit
+
+        if not partial_root:
+            table.store(root_key, max_depth + 1, best_score, EXACT,
+                        transform_bits(best_bit, transform, lines.size))
+        completed_depth = max_depth
+        return best_bit, best_score
+
+    horizon = MAX_DEPTH
+    if not limits.interruptible:
+        best_bit, best_score = search_root(MAX_DEPTH)
+    else:
+        # Searching past the last empty cell gains nothing; with only a
+        # stop_event the search deepens no further than the fixed MAX_DEPTH
+        max_depth = bin(empty).count("1") - 1
+        if not limits.bounded:
+            max_depth = min(max_depth, MAX_DEPTH)
+        best_bit, best_score = iterative_deepening(search_root, max_depth, limits)
+        if best_bit is None:
+            best_bit = root_moves[0]
+
+    last_search_stats.clear()
+    last_search_stats.update({
+        "score": best_score,
+        "nodes": limits.nodes,
+        "depth": completed_depth,
+        "qnodes": qnodes,
+        "tt_hits": table.hits - tt_hits,
+        "elapsed": limits.elapsed(),
+    })
+    return lines.bit_to_cell(best_bit)
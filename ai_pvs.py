@@ -0,0 +1,238 @@
+# ai_pvs.py
+from utils import to_bitboard, iter_bits, DEFAULT_LINES
+from search_board import SearchBoard, default_proximity
+from transposition import get_table, piece_keys, zobrist_hash, ZOBRIST_SIDE, EXACT, LOWER, UPPER
+from symmetry import canonical_hash, transform_bits, unique_moves, INVERSE
+from search_control import SearchLimits, iterative_deepening
+from evaluation import WIN_SCORE
+from tablebase import TABLEBASE_EMPTY, solved_move, probe_score
+from quiescence import QUIESCENCE_NODE_LIMIT, quiescence
+from move_ordering import MoveOrderer, static_order
+MAX_DEPTH = 3
+
+# Half-width of the aspiration window around the previous iteration's score:
+# one two-in-a-row line. Narrower windows fail often, and every
+# fail costs a second root search.
+ASPIRATION_DELTA = 100
+
+# Counters from the most recent call, for benchmarks and tuning
+last_search_stats = {}
+
+def get_best_move_pvs(board, player, time_limit_ms=None, node_limit=None, stop_event=None,
+                      progress=None, proximity=None,
+                      quiescence_limit=QUIESCENCE_NODE_LIMIT):
+    """
+    Principal Variation Search (NegaScout) in negamax form.
+    The first move at each node gets the full window, the rest a null window
+    that is only re-searched when it fails high inside the window. Every
+    iteration of the deepening loop after the first starts with an
+    aspiration window around the previous score.
+    Limits, stop_event, progress, proximity and quiescence_limit behave as in
+    get_best_move_alpha_beta; without any of them this is one fixed
+    MAX_DEPTH search.
+    """
+    opponent = "X" if player == "O" else "O"
+    bitboard = to_bitboard(board)
+    lines = bitboard.lines
+    # The tablebase only covers the standard 5x5 game
+    tablebase_empty = TABLEBASE_EMPTY if lines is DEFAULT_LINES else -1
+    table = get_table("pvs")
+    table.new_search()
+    limits = SearchLimits(time_limit_ms, node_limit, stop_event, progress)
+    orderer = MoveOrderer(lines=lines)
+    # Side 0 is player, side 1 the opponent, matching MoveOrderer's history tables
+    side_keys = (piece_keys(player), piece_keys(opponent))
+    cutoffs = 0
+    researches = 0
+    completed_depth = None
+    tt_hits = table.hits
+    qnodes = 0
+
+    def pvs(key, depth, alpha, beta):
+        # Scores are from the point of view of the side to move
+        nonlocal cutoffs, researches, qnodes
+        limits.count_node()
+        # Wins are detected by the parent when it makes the move. With no
+        # live line left (including a full board) the game is a draw.
+        if not position.live_lines:
+            return 0
+        side = (depth + 1) & 1
+        if position.empty_count <= tablebase_empty:
+            known = probe_score(position.bits[side], position.bits[1 - side], depth)
+            if known is not None:
+                return known
+        # Cells on dead lines only can't change the result
+        candidates = position.moves()
+        remaining = horizon - depth
+        if remaining <= 0:
+            if not quiescence_limit:
+                return -position.score if side else position.score
+            score, blocks = quiescence(position, depth, side, quiescence_limit)
+            qnodes += blocks
+            return score
+
+        entry = table.probe(key, ply=depth)
+        hash_move = None
+        if entry is not None:
+            stored_depth, value, flag, hash_move = entry
+            if stored_depth >= remaining:
+                if flag == EXACT:
+                    return value
+                elif flag == LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+        alpha_orig = alpha
+        keys = side_keys[side]
+
+        best = -float("inf")
+        best_bit = None
+        for index, bit in enumerate(orderer.order(candidates, depth, side, hash_move)):
+            if position.make_move(bit, side):
+                score = WIN_SCORE - depth - 1
+            else:
+                child_key = key ^ keys[bit] ^ ZOBRIST_SIDE
+                if index == 0:
+                    score = -pvs(child_key, depth + 1, -beta, -alpha)
+                else:
+                    score = -pvs(child_key, depth + 1, -alpha - 1, -alpha)
+                    # A child on the horizon is scored exactly whatever the
+                    # window, so only deeper children need the re-search
+                    if alpha < score < beta and remaining > 1:
+                        researches += 1
+                        score = -pvs(child_key, depth + 1, -beta, -score)
+            position.unmake_move(bit, side)
+            if score > best:
+                best = score
+                best_bit = bit
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                cutoffs += 1
+                orderer.record_cutoff(bit, depth, side, remaining)
+                break
+
+        if best <= alpha_orig:
+            flag = UPPER
+        elif best >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        table.store(key, remaining, best, flag, best_bit, ply=depth)
+        return best
+
+    own = bitboard.bits(player)
+    other = bitboard.bits(opponent)
+    plain_key = zobrist_hash(bitboard.x, bitboard.o, player, lines)
+    empty = lines.full_mask & ~(own | other)
+    if proximity is None:
+        proximity = default_proximity(lines)
+    position = SearchBoard(own, other, lines, proximity)
+    # Late in the game the position is solved outright
+    if position.live_lines and position.empty_count <= tablebase_empty:
+        move, _ = solved_move(own, other)
+        last_search_stats.clear()
+        last_search_stats.update({
+            "score": probe_score(own, other, -1),
+            "nodes": 0,
+            "cutoffs": 0,
+            "researches": 0,
+            "depth": None,
+            "qnodes": 0,
+            "tt_hits": 0,
+            "elapsed": limits.elapsed(),
+        })
+        return move
+    # On a dead draw every move is equal; otherwise skip cells on dead lines only
+    root_cells = position.moves() or empty
+    root_moves = static_order(unique_moves(own, other, iter_bits(root_cells), lines.size), lines)
+    if not root_moves:
+        return None
+    root_key, transform = canonical_hash(bitboard.x, bitboard.o, player, lines)
+
+    def search_window(alpha, beta):
+        best_score = -float("inf")
+        best_bit = None
+        for index, bit in enumerate(root_moves):
+            if position.make_move(bit, 0):
+                score = WIN_SCORE
+            else:
+                child_key = plain_key ^ side_keys[0][bit] ^ ZOBRIST_SIDE
+                if index == 0:
+                    score = -pvs(child_key, 0, -beta, -alpha)
+                else:
+                    score = -pvs(child_key, 0, -alpha - 1, -alpha)
+                    if alpha < score < beta:
+                        score = -pvs(child_key, 0, -beta, -score)
+            position.unmake_move(bit, 0)
+            if score > best_score:
+                best_score = score
+                best_bit = bit
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+        return best_bit, best_score
+
+    previous_score = None
+
+    def search_root(max_depth):
+        nonlocal horizon, completed_depth, previous_score, researches
+        horizon = max_depth
+        entry = table.probe(root_key)
+        if entry is not None and entry[0] > max_depth and entry[2] == EXACT and entry[3] is not None:
+            completed_depth = max_depth
+            previous_score = entry[1]
+            return transform_bits(entry[3], INVERSE[transform], lines.size), entry[1]
+
+        if previous_score is None:
+            best_bit, best_score = search_window(-float("inf"), float("inf"))
+        else:
+            alpha = previous_score - ASPIRATION_DELTA
+            beta = previous_score + ASPIRATION_DELTA
+            best_bit, best_score = search_window(alpha, beta)
+            # Outside the aspiration window the score is only a bound; open
+            # the window on that side and search again
+            while best_score <= alpha or best_score >= beta:
+                researches += 1
+                if best_score <= alpha:
+                    alpha = -float("inf")
+                else:
+                    beta = float("inf")
+                best_bit, best_score = search_window(alpha, beta)
+
+        root_moves.remove(best_bit)
+        root_moves.insert(0, best_bit)
+        table.store(root_key, max_depth + 1, best_score, EXACT,
+                    transform_bits(best_bit, transform, lines.size))
+        completed_depth = max_depth
+        previous_score = best_score
+        return best_bit, best_score
+
+    horizon = MAX_DEPTH
+    if not limits.interruptible:
+        # One fixed-depth pass, as in get_best_move_alpha_beta; shallower
+        # iterations would only add nodes when the search can't be cut short
+        best_bit, best_score = search_root(MAX_DEPTH)
+    else:
+        # Searching past the last empty cell gains nothing; with only a
+        # stop_event the search deepens no further than the fixed MAX_DEPTH
+        max_depth = bin(empty).count("1") - 1
+        if not limits.bounded:
+            max_depth = min(max_depth, MAX_DEPTH)
+        best_bit, best_score = iterative_deepening(search_root, max_depth, limits)
+        if best_bit is None:
+            best_bit = root_moves[0]
+
+    last_search_stats.clear()
+    last_search_stats.update({
+        "score": best_score,
+        "nodes": limits.nodes,
+        "cutoffs": cutoffs,
+        "researches": researches,
+        "depth": completed_depth,
+        "qnodes": qnodes,
+        "tt_hits": table.hits - tt_hits,
+        "elapsed": limits.elapsed(),
+    })
+    return lines.bit_to_cell(best_bit)
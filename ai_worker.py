@@ -0,0 +1,137 @@
+# ai_worker.py
+import threading
+import time
+from PyQt5.QtCore import QThread, pyqtSignal
+from utils import iter_bits
+from move_ordering import static_order
+from search_control import DEFAULT_TIME_LIMIT_MS
+
+# Budget for guessing the human's reply before pondering the answers to it
+PREDICTION_TIME_MS = 200
+
+
+def likely_replies(board, human, ai_function, stop_event=None):
+    """
+    Human replies to ponder, most likely first: the engine's own pick for the
+    human, then the remaining cells on live lines by number of lines through them.
+    """
+    lines = board.lines
+    empty = board.empty_mask()
+    cells = static_order(iter_bits(empty & lines.live_cells(board.x, board.o) or empty), lines)
+    replies = [lines.bit_to_cell(bit) for bit in cells]
+    predicted = ai_function(board, human, time_limit_ms=PREDICTION_TIME_MS, stop_event=stop_event)
+    if predicted in replies:
+        replies.remove(predicted)
+        replies.insert(0, predicted)
+    return replies
+
+
+class PonderWorker(QThread):
+    """
+    Searches the AI's answer to each likely human reply while the human
+    thinks. Answers land in results, keyed by the board after the reply, and
+    every search also warms the engine's transposition table for the real one.
+    """
+
+    def __init__(self, board, ai_function, algo_name, ai_player="O", human_player="X",
+                 time_limit_ms=DEFAULT_TIME_LIMIT_MS, parent=None):
+        super().__init__(parent)
+        self.board = board.copy()
+        self.ai_function = ai_function
+        self.algo_name = algo_name
+        self.ai_player = ai_player
+        self.human_player = human_player
+        self.time_limit_ms = time_limit_ms
+        self.results = {}
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._current = None
+        self._finish_current = False
+
+    def run(self):
+        try:
+            replies = likely_replies(self.board, self.human_player, self.ai_function, self._stop)
+        except Exception:
+            return
+
+        for row, col in replies:
+            child = self.board.copy()
+            child.place(row, col, self.human_player)
+            if child.is_winning_move(row, col) or child.is_drawn():
+                continue
+            key = (child.x, child.o)
+            with self._lock:
+                if self._stop.is_set() or self._finish_current:
+                    return
+                self._current = key
+
+            move = self.ai_function(child, self.ai_player, time_limit_ms=self.time_limit_ms,
+                                    stop_event=self._stop)
+
+            with self._lock:
+                self._current = None
+                # An interrupted search only got part of its budget; don't reuse it
+                if not self._stop.is_set():
+                    self.results[key] = move
+                if self._finish_current:
+                    return
+
+    def take(self, board):
+        """
+        Stop pondering and return the answer for board if one was pondered.
+        If board is the reply being searched right now, that search is allowed
+        to finish first.
+        """
+        key = (board.x, board.o)
+        with self._lock:
+            if key in self.results:
+                self._stop.set()
+            elif key == self._current:
+                self._finish_current = True
+            else:
+                self._stop.set()
+        self.wait()
+        return self.results.get(key)
+
+    def stop(self):
+        self._stop.set()
+        self.wait()
+
+
+class AIMoveWorker(QThread):
+    """
+    Finds the AI's move off the Qt event loop. move_ready(move, algo_name,
+    seconds) is emitted when the search finishes and progress(depth, nodes)
+    after each depth it completes. A cancelled search emits nothing.
+    """
+
+    move_ready = pyqtSignal(object, str, float)
+    progress = pyqtSignal(int, int)
+
+    def __init__(self, board, ai_function, algo_name, ai_player="O", ponder_worker=None,
+                 time_limit_ms=DEFAULT_TIME_LIMIT_MS, parent=None):
+        super().__init__(parent)
+        self.board = board.copy()
+        self.ai_function = ai_function
+        self.algo_name = algo_name
+        self.ai_player = ai_player
+        self.ponder_worker = ponder_worker
+        self.time_limit_ms = time_limit_ms
+        self._stop = threading.Event()
+
+    def run(self):
+        start_time = time.time()
+        move = None
+        if self.ponder_worker is not None:
+            move = self.ponder_worker.take(self.board)
+        if move is None and not self._stop.is_set():
+            move = self.ai_function(self.board, self.ai_player, time_limit_ms=self.time_limit_ms,
+                                    stop_event=self._stop, progress=self.progress.emit)
+        if not self._stop.is_set():
+            self.move_ready.emit(move, self.algo_name, time.time() - start_time)
+
+    def cancel(self):
+        self._stop.set()
+        if self.ponder_worker is not None:
+            self.ponder_worker.stop()
+        self.wait()
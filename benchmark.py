@@ -2,10 +2,12 @@ import time
 import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
+import ai_minimax
+import ai_alpha_beta
 from ai_minimax import get_best_move_minimax
 from ai_alpha_beta import get_best_move_alpha_beta
-from utils import check_winner, get_empty_cells
-import random
+from transposition import clear_tables
+from playout_simulator import random_positions
 
 class AlgorithmBenchmark:
    
@@ -29,119 +31,23 @@ class AlgorithmBenchmark:
         self.minimax_nodes = 0
         self.alphabeta_nodes = 0
     
-    def _create_board_with_fill_percentage(self, fill_percentage):
-        
-        board = [[" " for _ in range(5)] for _ in range(5)]
+    def _create_boards_with_fill_percentage(self, fill_percentage, count):
+        """count undecided boards reached by random play with the given share of cells filled"""
         total_cells = 25
         cells_to_fill = int(total_cells * fill_percentage / 100)
-        
-        # Get all possible positions
-        all_positions = [(i, j) for i in range(5) for j in range(5)]
-        random.shuffle(all_positions)
-        
-        # Fill board with alternating X and O
-        symbols = ["X", "O"]
-        for i in range(cells_to_fill):
-            row, col = all_positions[i]
-            board[row][col] = symbols(["X","O"])#[i % 2]
-        
-        return board
+        return [board.to_list() for board in random_positions(count, cells_to_fill)]
     
     def _count_nodes_minimax(self, board, player):
-        """Modified minimax that counts nodes explored"""
-        def minimax_counter(board, depth, is_maximizing):
-            nonlocal node_count
-            node_count += 1
-            
-            opponent = "X" if player == "O" else "O"
-
-            if check_winner(board, player):
-                return 1
-            elif check_winner(board, opponent):
-                return -1
-            elif not get_empty_cells(board) or depth >= 3:  # MAX_DEPTH = 3
-                return 0
-
-            if is_maximizing:
-                best = -float("inf")
-                for row, col in get_empty_cells(board):
-                    board[row][col] = player
-                    val = minimax_counter(board, depth + 1, False)
-                    board[row][col] = " "
-                    best = max(best, val)
-                return best
-            else:
-                best = float("inf")
-                for row, col in get_empty_cells(board):
-                    board[row][col] = opponent
-                    val = minimax_counter(board, depth + 1, True)
-                    board[row][col] = " "
-                    best = min(best, val)
-                return best
-
-        node_count = 0
-        best_score = -float("inf")
-        best_move = None
-        for row, col in get_empty_cells(board):
-            board[row][col] = player
-            score = minimax_counter(board, 0, False)
-            board[row][col] = " "
-            if score > best_score:
-                best_score = score
-                best_move = (row, col)
-        
-        return best_move, node_count
+        """Run the Minimax engine from a cold cache and report nodes explored"""
+        clear_tables()
+        best_move = get_best_move_minimax(board, player)
+        return best_move, ai_minimax.last_search_stats["nodes"]
     
     def _count_nodes_alphabeta(self, board, player):
-        """Modified alpha-beta that counts nodes explored"""
-        def alphabeta_counter(board, depth, alpha, beta, maximizing):
-            nonlocal node_count
-            node_count += 1
-            
-            opponent = "X" if player == "O" else "O"
-
-            if check_winner(board, player):
-                return 1
-            elif check_winner(board, opponent):
-                return -1
-            elif not get_empty_cells(board) or depth >= 3:  # MAX_DEPTH = 3
-                return 0
-
-            if maximizing:
-                max_eval = -float("inf")
-                for row, col in get_empty_cells(board):
-                    board[row][col] = player
-                    eval = alphabeta_counter(board, depth + 1, alpha, beta, False)
-                    board[row][col] = " "
-                    max_eval = max(max_eval, eval)
-                    alpha = max(alpha, eval)
-                    if beta <= alpha:
-                        break
-                return max_eval
-            else:
-                min_eval = float("inf")
-                for row, col in get_empty_cells(board):
-                    board[row][col] = opponent
-                    eval = alphabeta_counter(board, depth + 1, alpha, beta, True)
-                    board[row][col] = " "
-                    min_eval = min(min_eval, eval)
-                    beta = min(beta, eval)
-                    if beta <= alpha:
-                        break
-                return min_eval
-
-        node_count = 0
-        best_score = -float("inf")
-        best_move = None
-        for row, col in get_empty_cells(board):
-            board[row][col] = player
-            score = alphabeta_counter(board, 0, -float("inf"), float("inf"), False)
-            board[row][col] = " "
-            if score > best_score:
-                best_score = score
-                best_move = (row, col)
-        
-        return best_move, node_count
+        """Run the Alpha-Beta engine from a cold cache and report nodes explored"""
+        clear_tables()
+        best_move = get_best_move_alpha_beta(board, player)
+        return best_move, ai_alpha_beta.last_search_stats["nodes"]
     
     def run_benchmark(self, iterations=10):
        
@@ -151,13 +57,9 @@ class AlgorithmBenchmark:
         for fill in fill_percentages:
             print(f"Testing with {fill}% board fill...")
             
-            for i in range(iterations):
-                board = self._create_board_with_fill_percentage(fill)
-                
-                # Skip boards where the game is already over
-                if check_winner(board, "X") or check_winner(board, "O") or not get_empty_cells(board):
-                    continue
-                
+            # Positions from random play, keeping only games that are still undecided
+            boards = self._create_boards_with_fill_percentage(fill, iterations)
+            for i, board in enumerate(boards):
                 # Measure Minimax performance
                 start_time = time.time()
                 minimax_move, minimax_nodes = self._count_nodes_minimax(board, "O")
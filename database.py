@@ -1,54 +1,241 @@
 import sqlite3
 import os
+import atexit
+import threading
+import time
+from collections import OrderedDict
+from itertools import groupby
 import matplotlib.pyplot as plt
 import numpy as np
 from datetime import datetime
 
+DB_PATH = "tic_tac_toe.db"
+
+# Compiled statements kept per connection; every query here is a fixed
+# string, so each one is prepared once per connection and then reused
+STATEMENT_CACHE_SIZE = 64
+
+_local = threading.local()
+_connections = []
+_connections_lock = threading.Lock()
+# Bumped by close_connections so threads reopen instead of using a closed connection
+_generation = 0
+# Database file whose schema is up to date; set by the first connection to it
+_schema_path = None
+_schema_lock = threading.Lock()
+
+# Names kept by each of the player and algorithm id caches
+ID_CACHE_SIZE = 256
+
 
 # Database connection with error handling
 def get_db_connection():
-    try:
-        conn = sqlite3.connect("tic_tac_toe.db")
+    """
+    This thread's connection, opened on first use and kept for later calls.
+    WAL journaling lets readers run alongside the writer, and with
+    synchronous=NORMAL a commit only appends to the WAL instead of waiting
+    for an fsync; the WAL is synced when it is checkpointed. The first
+    connection to a database file brings its schema up to date, so merely
+    importing this module leaves the file alone.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is not None and _local.generation == _generation:
         return conn
+    try:
+        # Connections are only used by the thread that opened them, but
+        # close_connections may close them from another one
+        conn = sqlite3.connect(DB_PATH, cached_statements=STATEMENT_CACHE_SIZE,
+                               check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
     except sqlite3.Error as e:
         print(f"Database connection error: {e}")
         raise
+    if _schema_path != DB_PATH:
+        try:
+            initialize_database(conn)
+        except sqlite3.Error:
+            conn.close()
+            raise
+    _local.conn = conn
+    _local.generation = _generation
+    with _connections_lock:
+        _connections.append(conn)
+    return conn
 
 
-def initialize_database():
-    """Initialize database with proper schema and validation"""
-    try:
+def close_connections():
+    """Close every thread's connection; the next call in each thread opens a new one"""
+    global _generation
+    with _connections_lock:
+        _generation += 1
+        for conn in _connections:
+            conn.close()
+        _connections.clear()
+
+
+atexit.register(close_connections)
+
+
+# Queued rows are written once this many are waiting, or this many seconds
+# after the oldest of them was queued, whichever comes first
+FLUSH_BATCH_SIZE = 32
+FLUSH_INTERVAL = 0.5
+
+
+class WriteBehindQueue:
+    """
+    Writes queued by the game and run by a background thread, so a
+    move or result never waits for the disk. Each flush writes everything
+    queued so far in one transaction. Rows queued after close() are
+    written straight away by the caller.
+    """
+
+    def __init__(self, batch_size=FLUSH_BATCH_SIZE, interval=FLUSH_INTERVAL):
+        self.batch_size = batch_size
+        self.interval = interval
+        self._pending = []
+        self._oldest = None
+        self._writing = 0
+        self._flush_requested = False
+        self._closed = False
+        self._thread = None
+        self._condition = threading.Condition()
+        self.flushes = 0
+        self.rows_written = 0
+        self.rows_failed = 0
+        self.last_flush_latency = None
+        self.max_flush_latency = 0.0
+
+    def put(self, sql, params):
+        with self._condition:
+            if not self._closed:
+                if not self._pending:
+                    # The writer sleeps until a row arrives, then times the interval from it
+                    self._oldest = time.monotonic()
+                    self._condition.notify_all()
+                self._pending.append((sql, params))
+                if len(self._pending) >= self.batch_size:
+                    self._condition.notify_all()
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+                    self._thread.start()
+                return
+        self._write([(sql, params)])
+
+    def depth(self):
+        """Rows queued or being written"""
+        with self._condition:
+            return len(self._pending) + self._writing
+
+    def flush(self, wait=True):
+        """Write the queued rows now; with wait, return once they are on disk"""
+        with self._condition:
+            if not self._pending and not self._writing:
+                return
+            self._flush_requested = True
+            self._condition.notify_all()
+            while wait and (self._pending or self._writing):
+                self._condition.wait()
+
+    def close(self):
+        """Write everything still queued and stop the writer thread"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+
+    def _due(self):
+        return (self._closed or self._flush_requested or len(self._pending) >= self.batch_size
+                or time.monotonic() - self._oldest >= self.interval)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not (self._pending and self._due()):
+                    if self._closed and not self._pending:
+                        self._thread = None
+                        return
+                    timeout = None
+                    if self._pending:
+                        timeout = max(0.0, self._oldest + self.interval - time.monotonic())
+                    self._condition.wait(timeout)
+                batch = self._pending
+                self._pending = []
+                self._writing = len(batch)
+                self._flush_requested = False
+            self._write(batch)
+            with self._condition:
+                self._writing = 0
+                self._condition.notify_all()
+
+    def _write(self, batch):
+        started = time.perf_counter()
         conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Create players Table
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS players (
-            player_id INTEGER PRIMARY KEY,
-            player_name TEXT NOT NULL UNIQUE,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        ''')
-        #Crate results Table
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS results (
-            result_id INTEGER PRIMARY KEY,
+        try:
+            with conn:
+                for sql, rows in groupby(batch, key=lambda row: row[0]):
+                    conn.executemany(sql, [params for _, params in rows])
+        except sqlite3.Error as e:
+            print(f"Error writing queued rows: {e}")
+            self.rows_failed += len(batch)
+        else:
+            self.rows_written += len(batch)
+        latency = time.perf_counter() - started
+        self.flushes += 1
+        self.last_flush_latency = latency
+        self.max_flush_latency = max(self.max_flush_latency, latency)
+
+
+_writes = WriteBehindQueue()
+# Registered after close_connections, so it runs first at exit
+atexit.register(_writes.close)
+
+
+def flush_writes(wait=True):
+    """Write all queued moves and results now; with wait, block until they are stored"""
+    _writes.flush(wait)
+
+
+def get_write_stats():
+    """Queue depth and flush counters of the write-behind queue, for monitoring"""
+    return {
+        "queued": _writes.depth(),
+        "flushes": _writes.flushes,
+        "rows_written": _writes.rows_written,
+        "rows_failed": _writes.rows_failed,
+        "last_flush_latency": _writes.last_flush_latency,
+        "max_flush_latency": _writes.max_flush_latency,
+    }
+
+
+def use_database(path):
+    """Keep the data in the database file at path from now on; it is opened on first use"""
+    global DB_PATH
+    flush_writes()
+    close_connections()
+    clear_id_caches()
+    DB_PATH = path
+
+
+GAMES_SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS games (
+            game_id INTEGER PRIMARY KEY AUTOINCREMENT,
             player_id INTEGER NOT NULL,
+            algorithm_id INTEGER,
+            started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            ended_at TIMESTAMP,
             result TEXT CHECK(result IN ('Win', 'Loss', 'Draw')),
-            game_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (player_id) REFERENCES players(player_id)
-        )
-        ''')
-        #Create ai_algorithms Table
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS ai_algorithms (
-            algorithm_id INTEGER PRIMARY KEY,
-            algorithm_name TEXT NOT NULL UNIQUE
+            FOREIGN KEY (player_id) REFERENCES players(player_id),
+            FOREIGN KEY (algorithm_id) REFERENCES ai_algorithms(algorithm_id)
         )
-        ''')
-        #Create ai_timings Table
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS ai_timings (
+        '''
+
+AI_TIMINGS_SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS {table} (
             timing_id INTEGER PRIMARY KEY,
             player_id INTEGER NOT NULL,
             algorithm_id INTEGER NOT NULL,
@@ -57,45 +244,193 @@ def initialize_database():
             game_id INTEGER NOT NULL,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (player_id) REFERENCES players(player_id),
-            FOREIGN KEY (algorithm_id) REFERENCES ai_algorithms(algorithm_id)
+            FOREIGN KEY (algorithm_id) REFERENCES ai_algorithms(algorithm_id),
+            FOREIGN KEY (game_id) REFERENCES games(game_id)
         )
-        ''')
-        
-        # Insert default algorithms
-        cursor.execute("INSERT OR IGNORE INTO ai_algorithms (algorithm_id, algorithm_name) VALUES (1, 'Minimax')")
-        cursor.execute("INSERT OR IGNORE INTO ai_algorithms (algorithm_id, algorithm_name) VALUES (2, 'Alpha-Beta')")
-        
-        conn.commit()
-        print("Database initialized successfully")
+        '''
+
+
+def _create_tables(cursor):
+    """Version 1: the original tables and the built-in algorithms"""
+    # Create players Table
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS players (
+        player_id INTEGER PRIMARY KEY,
+        player_name TEXT NOT NULL UNIQUE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+    #Crate results Table
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS results (
+        result_id INTEGER PRIMARY KEY,
+        player_id INTEGER NOT NULL,
+        result TEXT CHECK(result IN ('Win', 'Loss', 'Draw')),
+        game_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (player_id) REFERENCES players(player_id)
+    )
+    ''')
+    #Create ai_algorithms Table
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS ai_algorithms (
+        algorithm_id INTEGER PRIMARY KEY,
+        algorithm_name TEXT NOT NULL UNIQUE
+    )
+    ''')
+    #Create ai_timings Table
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS ai_timings (
+        timing_id INTEGER PRIMARY KEY,
+        player_id INTEGER NOT NULL,
+        algorithm_id INTEGER NOT NULL,
+        move_time REAL NOT NULL,
+        move_number INTEGER NOT NULL,
+        game_id INTEGER NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (player_id) REFERENCES players(player_id),
+        FOREIGN KEY (algorithm_id) REFERENCES ai_algorithms(algorithm_id)
+    )
+    ''')
+    
+    # Insert default algorithms
+    cursor.execute("INSERT OR IGNORE INTO ai_algorithms (algorithm_id, algorithm_name) VALUES (1, 'Minimax')")
+    cursor.execute("INSERT OR IGNORE INTO ai_algorithms (algorithm_id, algorithm_name) VALUES (2, 'Alpha-Beta')")
+    cursor.execute("INSERT OR IGNORE INTO ai_algorithms (algorithm_id, algorithm_name) VALUES (3, 'PVS')")
+    cursor.execute("INSERT OR IGNORE INTO ai_algorithms (algorithm_id, algorithm_name) VALUES (4, 'MCTS')")
+
+
+def _add_games(cursor):
+    """
+    Version 2: the games table. Every game_id used by ai_timings becomes a
+    game, keeping its id. Each result is matched to the latest unfinished
+    game its player had started by then, or gets a game of its own when
+    there is none.
+    """
+    if cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'games'").fetchone():
+        return  # created by a build from before schema versions
+    cursor.execute(GAMES_SCHEMA)
+    cursor.execute("""
+        INSERT INTO games (game_id, player_id, algorithm_id, started_at, ended_at)
+        SELECT game_id, MIN(player_id), MIN(algorithm_id), MIN(created_at), MAX(created_at)
+        FROM ai_timings
+        GROUP BY game_id
+    """)
+    cursor.execute("ALTER TABLE results ADD COLUMN game_id INTEGER REFERENCES games(game_id)")
+    results = cursor.execute(
+        "SELECT result_id, player_id, result, game_date FROM results ORDER BY game_date, result_id").fetchall()
+    for result_id, player_id, result, game_date in results:
+        game = cursor.execute("""
+            SELECT game_id FROM games
+            WHERE player_id = ? AND result IS NULL AND started_at <= ?
+            ORDER BY started_at DESC LIMIT 1
+        """, (player_id, game_date)).fetchone()
+        if game is None:
+            cursor.execute(
+                "INSERT INTO games (player_id, started_at, ended_at, result) VALUES (?, ?, ?, ?)",
+                (player_id, game_date, game_date, result))
+            game_id = cursor.lastrowid
+        else:
+            game_id = game[0]
+            cursor.execute("UPDATE games SET result = ?, ended_at = ? WHERE game_id = ?",
+                           (result, game_date, game_id))
+        cursor.execute("UPDATE results SET game_id = ? WHERE result_id = ?", (game_id, result_id))
+
+    # A foreign key can't be added to an existing table, so ai_timings is rebuilt
+    cursor.execute(AI_TIMINGS_SCHEMA.format(table="ai_timings_new"))
+    cursor.execute("INSERT INTO ai_timings_new SELECT * FROM ai_timings")
+    cursor.execute("DROP TABLE ai_timings")
+    cursor.execute("ALTER TABLE ai_timings_new RENAME TO ai_timings")
+    if results:
+        print(f"Migrated {len(results)} results to the games table")
+
+
+def _add_indexes(cursor):
+    """
+    Version 3: indexes for the queries that grow with every AI move. The
+    game index also carries algorithm_id, so the performance chart groups
+    by game and algorithm straight off the index.
+    """
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_ai_timings_game ON ai_timings(game_id, algorithm_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_ai_timings_algorithm ON ai_timings(algorithm_id, created_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_results_player ON results(player_id, game_date)")
+
+
+# Schema changes in order; a database at PRAGMA user_version N has had the
+# first N applied. New changes go at the end, never in between.
+MIGRATIONS = [_create_tables, _add_games, _add_indexes]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def migrate(conn):
+    """
+    Apply the migrations the database hasn't had yet, each in its own
+    transaction together with the new user_version. Returns the versions
+    applied; an up-to-date database costs one PRAGMA read.
+    """
+    applied = []
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+        return applied
+    while True:
+        with conn:
+            # IMMEDIATE takes the write lock first, so two processes opening
+            # the same old file can't both apply a migration
+            conn.execute("BEGIN IMMEDIATE")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version >= SCHEMA_VERSION:
+                return applied
+            MIGRATIONS[version](conn.cursor())
+            conn.execute(f"PRAGMA user_version = {version + 1}")
+        applied.append(version + 1)
+
+
+def initialize_database(conn=None):
+    """
+    Bring the schema of the current database up to date, once per file.
+    get_db_connection calls this with each new connection until it has
+    succeeded.
+    """
+    global _schema_path
+    try:
+        if conn is None:
+            conn = get_db_connection()
+        with _schema_lock:
+            if _schema_path != DB_PATH:
+                applied = migrate(conn)
+                if applied:
+                    print(f"Database migrated to schema version {applied[-1]}")
+                print("Database initialized successfully")
+                _schema_path = DB_PATH
         return conn
     except sqlite3.Error as e:
         print(f"Database initialization error: {e}")
-        if conn:
-            conn.rollback()
         raise
 
 #==========================================================Game History===========================================================
-def get_game_history():
-    """Retrieve complete game history from database"""
-    conn = None  # Initialize here to avoid UnboundLocalError
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
+GAME_HISTORY_QUERY = """
             SELECT 
-                r.result_id as game_id,
+                r.game_id,
                 p.player_name,
                 r.result,
                 r.game_date,
                 COUNT(at.timing_id) as moves_count
             FROM results r
             JOIN players p ON r.player_id = p.player_id
-            LEFT JOIN ai_timings at ON r.result_id = at.game_id
+            LEFT JOIN ai_timings at ON r.game_id = at.game_id
             GROUP BY r.result_id, p.player_name, r.result, r.game_date
             ORDER BY r.game_date ASC
             LIMIT 50;
-        """)
+        """
+
+
+def get_game_history():
+    """Retrieve complete game history from database"""
+    conn = None  # Initialize here to avoid UnboundLocalError
+    try:
+        flush_writes()
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute(GAME_HISTORY_QUERY)
         
         history_data = cursor.fetchall()
         return history_data
@@ -103,15 +438,64 @@ def get_game_history():
     except sqlite3.Error as e:
         print(f"Error fetching game history: {e}")
         return []
-        
-    finally:
-        if conn:
-            conn.close()
 
 #=======================================================================================================================
 
+class IdCache:
+    """
+    Bounded name -> id map that drops the least recently used name when
+    full. Only ids read from the database or inserted and committed go in,
+    so a rolled back insert or a fallback id is never handed out later.
+    """
+
+    def __init__(self, max_size=ID_CACHE_SIZE):
+        self.max_size = max_size
+        self._ids = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._ids)
+
+    def get(self, name):
+        with self._lock:
+            row_id = self._ids.get(name)
+            if row_id is None:
+                self.misses += 1
+            else:
+                self._ids.move_to_end(name)
+                self.hits += 1
+            return row_id
+
+    def put(self, name, row_id):
+        with self._lock:
+            self._ids[name] = row_id
+            self._ids.move_to_end(name)
+            if len(self._ids) > self.max_size:
+                self._ids.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._ids.clear()
+
+
+_player_ids = IdCache()
+_algorithm_ids = IdCache()
+
+
+def clear_id_caches():
+    """Forget every cached id; ids belong to one database file"""
+    _player_ids.clear()
+    _algorithm_ids.clear()
+
+
 def get_or_create_player(player_name):
-    """Get or create player ID from name"""
+    """Get or create player ID from name; known names are answered from the id cache"""
+    player_id = _player_ids.get(player_name)
+    if player_id is not None:
+        return player_id
+    conn = None
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
@@ -121,24 +505,26 @@ def get_or_create_player(player_name):
         player = cursor.fetchone()
         
         if player:
-            return player[0]
+            player_id = player[0]
         else:
-            # Create new player
+            # Create new player; cached only once the insert is committed
             cursor.execute("INSERT INTO players (player_name) VALUES (?)", (player_name,))
             conn.commit()
-            return cursor.lastrowid
+            player_id = cursor.lastrowid
+        _player_ids.put(player_name, player_id)
+        return player_id
     except sqlite3.Error as e:
         print(f"Player creation error: {e}")
         if conn:
             conn.rollback()
         return None
-    finally:
-        if conn:
-            conn.close()
 
 
 def get_algorithm_id(algorithm_name):
-    """Get algorithm ID from name"""
+    """Get algorithm ID from name; known names are answered from the id cache"""
+    algorithm_id = _algorithm_ids.get(algorithm_name)
+    if algorithm_id is not None:
+        return algorithm_id
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
@@ -147,37 +533,14 @@ def get_algorithm_id(algorithm_name):
         algorithm = cursor.fetchone()
         
         if algorithm:
+            _algorithm_ids.put(algorithm_name, algorithm[0])
             return algorithm[0]
         else:
-            # Fallback to default
+            # Fallback to default, not cached so the name is found once it is added
             return 1  # Default to Minimax
     except sqlite3.Error as e:
         print(f"Algorithm lookup error: {e}")
         return 1  # Default to Minimax
-    finally:
-        if conn:
-            conn.close()
-
-
-def get_new_game_id():
-    """Generate a new game ID based on timestamp"""
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT MAX(game_id) FROM ai_timings")
-        max_id = cursor.fetchone()[0]
-        
-        if max_id is None:
-            return 1
-        else:
-            return max_id + 1
-    except sqlite3.Error as e:
-        print(f"Game ID generation error: {e}")
-        return int(datetime.now().timestamp())  # Fallback
-    finally:
-        if conn:
-            conn.close()
 
 
 # Current game information
@@ -188,47 +551,66 @@ current_move_number = 0
 
 
 def start_new_game(player_name, algorithm_name):
-    """Initialize a new game session"""
+    """Open a row in the games table for a new game session and return its id"""
     global current_game_id, current_player_id, current_algorithm_id, current_move_number
     
     current_player_id = get_or_create_player(player_name)
-    current_algorithm_id = get_algorithm_id(algorithm_name)
-    current_game_id = get_new_game_id()
+    current_algorithm_id = None if algorithm_name is None else get_algorithm_id(algorithm_name)
+    try:
+        conn = get_db_connection()
+        with conn:
+            cursor = conn.execute(
+                "INSERT INTO games (player_id, algorithm_id) VALUES (?, ?)",
+                (current_player_id, current_algorithm_id)
+            )
+        current_game_id = cursor.lastrowid
+    except sqlite3.Error as e:
+        print(f"Error starting game: {e}")
+        current_game_id = None
     current_move_number = 0
     
     return current_game_id
 
 
+def end_game():
+    """Forget the current game; a game abandoned without a result keeps ended_at NULL"""
+    global current_game_id, current_move_number
+    current_game_id = None
+    current_move_number = 0
+
+
 def save_result(player_name, result):
-    """Save game result to database"""
+    """
+    Queue the game result and close the current game; the game is over, so
+    the queue is flushed in the background. Without a current game one is
+    opened for the result alone.
+    """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
         player_id = get_or_create_player(player_name)
+        if current_game_id is None or current_player_id != player_id:
+            start_new_game(player_name, None)
+        game_id = current_game_id
         
-        cursor.execute(
-            "INSERT INTO results (player_id, result) VALUES (?, ?)",
-            (player_id, result)
+        _writes.put(
+            "UPDATE games SET result = ?, ended_at = CURRENT_TIMESTAMP WHERE game_id = ?",
+            (result, game_id)
         )
-        
-        conn.commit()
+        _writes.put(
+            "INSERT INTO results (player_id, result, game_id) VALUES (?, ?, ?)",
+            (player_id, result, game_id)
+        )
+        flush_writes(wait=False)
+        end_game()
         print(f"Result saved to database: {player_name} - {result}")
     except sqlite3.Error as e:
         print(f"Error saving result: {e}")
-    finally:
-        if conn:
-            conn.close()
 
 
 def save_move_time(player_name, algorithm, time_taken):
-    """Save AI move time to database"""
+    """Queue an AI move time for the background writer"""
     global current_game_id, current_player_id, current_algorithm_id, current_move_number
     
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
         # Ensure we have valid IDs
         if current_player_id is None:
             current_player_id = get_or_create_player(player_name)
@@ -237,41 +619,40 @@ def save_move_time(player_name, algorithm, time_taken):
             current_algorithm_id = get_algorithm_id(algorithm)
             
         if current_game_id is None:
-            current_game_id = get_new_game_id()
+            start_new_game(player_name, algorithm)
             
         current_move_number += 1
         
-        cursor.execute(
+        _writes.put(
             """INSERT INTO ai_timings 
                (player_id, algorithm_id, move_time, move_number, game_id) 
                VALUES (?, ?, ?, ?, ?)""",
             (current_player_id, current_algorithm_id, time_taken, current_move_number, current_game_id)
         )
-        
-        conn.commit()
     except sqlite3.Error as e:
         print(f"Error saving move time: {e}")
-    finally:
-        if conn:
-            conn.close()
 
 #===================================================================================================================================
+PERFORMANCE_QUERY = """
+            SELECT a.algorithm_name, AVG(t.move_time) as avg_time, t.game_id
+            FROM ai_timings t
+            JOIN ai_algorithms a ON t.algorithm_id = a.algorithm_id
+            GROUP BY t.game_id, t.algorithm_id
+            ORDER BY t.game_id
+            LIMIT ?
+        """
+
+
 def generate_performance_chart(num_games=10):
     """Generate a chart comparing algorithm performance over games"""
     conn = None
     try:
+        flush_writes()
         conn = get_db_connection()
         cursor = conn.cursor()
         
         # Get average move times for each algorithm across games
-        cursor.execute("""
-            SELECT a.algorithm_name, AVG(t.move_time) as avg_time, t.game_id
-            FROM ai_timings t
-            JOIN ai_algorithms a ON t.algorithm_id = a.algorithm_id
-            GROUP BY t.game_id, a.algorithm_id
-            ORDER BY t.game_id
-            LIMIT ?
-        """, (num_games * 2,))  # 2 algorithms
+        cursor.execute(PERFORMANCE_QUERY, (num_games * 2,))  # 2 algorithms
         
         results = cursor.fetchall()
         
@@ -313,13 +694,3 @@ def generate_performance_chart(num_games=10):
     except Exception as e:
         print(f"Unexpected error in chart generation: {e}")
         return None
-    finally:
-        if conn:
-            conn.close()
-
-# Initialize the database when the module is imported
-try:
-    initialize_database()
-except Exception as e:
-    print(f"Warning: Database initialization failed: {e}")
-
@@ -4,6 +4,7 @@ import logging
 import sys
 import traceback
 from PyQt5.QtWidgets import QMessageBox
+from utils import BOARD_SIZE
 
 # Configure logging
 logging.basicConfig(
@@ -61,7 +62,7 @@ class ErrorHandler:
         ErrorHandler.show_error_dialog(parent, title, message, details)
     
     @staticmethod
-    def validate_move(row, col, board_size=5):
+    def validate_move(row, col, board_size=BOARD_SIZE):
         """
         Validate a move input.
         Raises ValueError with descriptive message if invalid.
@@ -96,9 +97,9 @@ class ErrorHandler:
         Validate algorithm choice.
         Raises ValueError with descriptive message if invalid.
         """
-        valid_choices = ['Minimax', 'Alpha-Beta', '1', '2']
+        valid_choices = ['Minimax', 'Alpha-Beta', 'PVS', 'MCTS', '1', '2', '3', '4']
         if choice not in valid_choices:
-            raise ValueError("Algorithm choice must be 'Minimax', 'Alpha-Beta', '1', or '2'")
+            raise ValueError("Algorithm choice must be 'Minimax', 'Alpha-Beta', 'PVS', 'MCTS', '1', '2', '3', or '4'")
             
         return True
     
@@ -0,0 +1,82 @@
+# evaluation.py
+from itertools import product
+from utils import BOARD_SIZE, CELL_COUNT, WIN_MASKS, iter_bits
+
+# Score for a completed line; wins found sooner score higher (WIN_SCORE - depth)
+WIN_SCORE = 1_000_000
+# Anything beyond this is a forced win or loss rather than a heuristic score
+WIN_THRESHOLD = WIN_SCORE - 1000
+
+# Value of a line that only one player has stones on, by number of stones.
+# A line holding both players' stones can never be won and is worth 0.
+LINE_SCORES = (0, 1, 10, 100, 1000)
+
+
+def line_scores(win_length):
+    """
+    LINE_SCORES for lines of win_length cells. A line one stone short of a
+    win is always worth 1000 and each stone fewer a tenth of that, down to 1.
+    """
+    return (0,) + tuple(10 ** max(0, count - win_length + 4) for count in range(1, win_length))
+
+
+def _line_score(own_count, other_count, scores=LINE_SCORES):
+    if own_count and other_count:
+        return 0
+    if own_count:
+        return scores[own_count] if own_count < len(scores) else WIN_SCORE
+    if other_count:
+        return -scores[other_count] if other_count < len(scores) else -WIN_SCORE
+    return 0
+
+
+_count_scores = {}
+
+
+def count_scores(win_length):
+    """
+    COUNT_SCORES[own_count][other_count]: the line values indexed by stone
+    counts, for boards that keep per-line counters. One table per win_length.
+    """
+    table = _count_scores.get(win_length)
+    if table is None:
+        scores = line_scores(win_length)
+        counts = range(win_length + 1)
+        table = _count_scores[win_length] = tuple(
+            tuple(_line_score(own, other, scores) for other in counts) for own in counts)
+    return table
+
+
+COUNT_SCORES = count_scores(BOARD_SIZE)
+
+
+def _build_pattern_tables():
+    """
+    For every line, a table of all 3^5 ways its cells can be filled.
+    Keys are (own & line) | (other & line) << CELL_COUNT so a lookup needs
+    no unpacking of the line.
+    """
+    tables = []
+    for line in WIN_MASKS:
+        cells = list(iter_bits(line))
+        table = {}
+        for states in product((0, 1, 2), repeat=len(cells)):
+            own = sum(bit for bit, state in zip(cells, states) if state == 1)
+            other = sum(bit for bit, state in zip(cells, states) if state == 2)
+            table[own | other << CELL_COUNT] = _line_score(states.count(1), states.count(2))
+        tables.append((line, table))
+    return tuple(tables)
+
+
+LINE_PATTERNS = _build_pattern_tables()
+
+
+def evaluate(own, other):
+    """
+    Static score of a position from own's point of view: open lines and
+    3- and 4-stone threats for own minus the same for other.
+    """
+    score = 0
+    for line, table in LINE_PATTERNS:
+        score += table[(own & line) | (other & line) << CELL_COUNT]
+    return score
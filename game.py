@@ -3,16 +3,22 @@
 import time
 import sys
 from ai_minimax import get_best_move_minimax
-from ai_alpha_beta import get_best_move_alpha_beta
-from utils import check_winner, get_empty_cells
-from database import save_result, save_move_time
+from opening_book import get_best_move_book
+from ai_pvs import get_best_move_pvs
+from ai_mcts import get_best_move_mcts
+from utils import BitBoard, BOARD_SIZE, MAX_BOARD_SIZE
+from database import start_new_game, save_result, save_move_time
+from transposition import clear_tables
+from search_control import DEFAULT_TIME_LIMIT_MS
 
 
 def print_board(board):
     try:
+        if isinstance(board, BitBoard):
+            board = board.to_list()
         for row in board:
             print(" | ".join(row))
-            print("-" * 19)
+            print("-" * (4 * len(row) - 1))
     except Exception as e:
         print(f"Error displaying board: {str(e)}")
 
@@ -31,6 +37,28 @@ def validate_input(value, min_val, max_val, input_type=""):
         return False, None
 
 
+def read_rules():
+    """Ask for the board size and the number in a row needed to win; Enter keeps 5x5"""
+    size = BOARD_SIZE
+    answer = input(f"Board size (3-{MAX_BOARD_SIZE}, Enter for {BOARD_SIZE}): ").strip()
+    if answer:
+        valid, value = validate_input(answer, 3, MAX_BOARD_SIZE, "Board size")
+        if valid:
+            size = value
+        else:
+            print(f"Using a {size}x{size} board.")
+
+    win_length = min(size, 5)
+    answer = input(f"Stones in a row to win (3-{size}, Enter for {win_length}): ").strip()
+    if answer:
+        valid, value = validate_input(answer, 3, size, "Win length")
+        if valid:
+            win_length = value
+        else:
+            print(f"Using {win_length} in a row.")
+    return size, win_length
+
+
 def start_game():
     try:
         
@@ -38,42 +66,59 @@ def start_game():
         if not name.strip():
             name = "Anonymous"
             print("Using 'Anonymous' as player name.")
+
+        size, win_length = read_rules()
         
-        algo_choice = input("Choose AI Algorithm: 1. Minimax 2. Alpha-Beta: ")
+        algo_choice = input("Choose AI Algorithm: 1. Minimax 2. Alpha-Beta 3. PVS 4. MCTS: ")
         
         if algo_choice == '1':
             ai_function = get_best_move_minimax
             algo_name = "Minimax"
         elif algo_choice == '2':
-            ai_function = get_best_move_alpha_beta
+            ai_function = get_best_move_book
             algo_name = "Alpha-Beta"
+        elif algo_choice == '3':
+            ai_function = get_best_move_pvs
+            algo_name = "PVS"
+        elif algo_choice == '4':
+            ai_function = get_best_move_mcts
+            algo_name = "MCTS"
         else:
             print("Invalid choice. Defaulting to Alpha-Beta.")
-            ai_function = get_best_move_alpha_beta
+            ai_function = get_best_move_book
             algo_name = "Alpha-Beta"
         
-        board = [[" " for _ in range(5)] for _ in range(5)]
+        board = BitBoard.empty(size, win_length)
         player_turn = True
+        last_move = None
+        clear_tables()  # cached positions are only reused within one game
+        start_new_game(name, algo_name)
         
         while True:
             try:
                 print_board(board)
                 
-                if check_winner(board, "X"):
+                # Only the player who just moved can have completed a line
+                winner = None
+                if last_move is not None and board.is_winning_move(*last_move):
+                    winner = board.get(*last_move)
+
+                if winner == "X":
                     print(f"Congratulations {name}! You win!")
                     save_result(name, "Win")
                     break
-                elif check_winner(board, "O"):
+                elif winner == "O":
                     print("AI wins!")
                     save_result(name, "Loss")
                     break
-                elif not get_empty_cells(board):
+                elif board.is_drawn():
+                    # Every line is blocked; no need to play out the remaining cells
                     print("It's a draw!")
                     save_result(name, "Draw")
                     break
                 
                 if player_turn:
-                    move = input("Enter your move as row,col (0-4): ")
+                    move = input(f"Enter your move as row,col (0-{size - 1}): ")
                     
                     try:
                         parts = move.split(',')
@@ -81,18 +126,19 @@ def start_game():
                             print("Input must be in format 'row,col'. Try again.")
                             continue
                             
-                        valid_row, row = validate_input(parts[0], 0, 4, "Row")
-                        valid_col, col = validate_input(parts[1], 0, 4, "Column")
+                        valid_row, row = validate_input(parts[0], 0, size - 1, "Row")
+                        valid_col, col = validate_input(parts[1], 0, size - 1, "Column")
                         
                         if not (valid_row and valid_col):
                             continue
                             
-                        if board[row][col] != " ":
+                        if board.get(row, col) != " ":
                             print("Cell is already taken. Try again.")
                             
                             continue
                             
-                        board[row][col] = "X"
+                        board.place(row, col, "X")
+                        last_move = (row, col)
                         player_turn = False
                     except Exception as e:
                         print(f"Error processing your move: {str(e)}. Try again.")
@@ -102,11 +148,12 @@ def start_game():
                     start_time = time.time()
                     
                     try:
-                        ai_move = ai_function(board, "O")
+                        ai_move = ai_function(board, "O", time_limit_ms=DEFAULT_TIME_LIMIT_MS)
                         move_time = time.time() - start_time
                         
                         if ai_move:
-                            board[ai_move[0]][ai_move[1]] = "O"
+                            board.place(ai_move[0], ai_move[1], "O")
+                            last_move = ai_move
                             print(f"AI placed O at position {ai_move[0]},{ai_move[1]}")
                             print(f"AI took {move_time:.4f} seconds to decide")
                             try:
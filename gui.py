@@ -2,14 +2,27 @@
 import sys
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QGridLayout, QPushButton, QLabel,
-    QVBoxLayout, QHBoxLayout, QComboBox, QLineEdit, QMessageBox
+    QVBoxLayout, QHBoxLayout, QComboBox, QLineEdit, QMessageBox, QCheckBox
 )
-import time  # For potential delays or timing
 from ai_minimax import get_best_move_minimax
-from ai_alpha_beta import get_best_move_alpha_beta
-from utils import check_winner, get_empty_cells
-from database import save_result, save_move_time
+from opening_book import get_best_move_book
+from ai_pvs import get_best_move_pvs
+from ai_mcts import get_best_move_mcts
+from utils import BitBoard, BOARD_SIZE
+from database import start_new_game, end_game, save_result, save_move_time
+from transposition import clear_tables
+from ai_worker import PonderWorker, AIMoveWorker
 
+# Engines offered in the algorithm box, by the name saved with move timings
+AI_ENGINES = {
+    "Minimax": get_best_move_minimax,
+    "Alpha-Beta": get_best_move_book,  # alpha-beta behind the opening book
+    "PVS": get_best_move_pvs,
+    "MCTS": get_best_move_mcts,
+}
+
+# Board sizes offered in the board box
+BOARD_SIZES = (5, 7, 9)
 
 
 class TicTacToeUI(QWidget):
@@ -17,10 +30,12 @@ class TicTacToeUI(QWidget):
         super().__init__()
         self.setWindowTitle("Tic-Tac-Toe")
         self.setGeometry(100, 100, 600, 600)
-        self.board = [[" "]*5 for _ in range(5)]
-        self.buttons = [[None]*5 for _ in range(5)]
+        self.board = BitBoard()
+        self.buttons = []
         self.player_name = ""
         self.current_turn = "Player"
+        self.ponder_worker = None
+        self.ai_worker = None
         self.init_ui()
         self.setStyleSheet("""
     QWidget {
@@ -59,12 +74,31 @@ class TicTacToeUI(QWidget):
         # Algorithm choice
         algo_layout = QHBoxLayout()
         self.algo_choice = QComboBox()
-        self.algo_choice.addItems(["Minimax", "Alpha-Beta"])
+        self.algo_choice.addItems(list(AI_ENGINES))
         self.algo_choice.setStyleSheet("color:white")
         algo_layout.addWidget(QLabel("AI Algorithm:"))
         algo_layout.addWidget(self.algo_choice)
         main_layout.addLayout(algo_layout)
 
+        # Board size and the number of stones in a row that wins
+        rules_layout = QHBoxLayout()
+        self.size_choice = QComboBox()
+        self.size_choice.addItems([f"{size}x{size}" for size in BOARD_SIZES])
+        self.size_choice.setStyleSheet("color:white")
+        self.size_choice.currentIndexChanged.connect(self.update_win_lengths)
+        self.win_choice = QComboBox()
+        self.win_choice.setStyleSheet("color:white")
+        self.update_win_lengths()
+        rules_layout.addWidget(QLabel("Board:"))
+        rules_layout.addWidget(self.size_choice)
+        rules_layout.addWidget(QLabel("In a row to win:"))
+        rules_layout.addWidget(self.win_choice)
+        main_layout.addLayout(rules_layout)
+
+        # Let the AI search its replies while the player is thinking
+        self.ponder_check = QCheckBox("Ponder during your turn")
+        self.ponder_check.setChecked(True)
+        main_layout.addWidget(self.ponder_check)
 
 #====================================================================================
         # Start button
@@ -81,13 +115,7 @@ class TicTacToeUI(QWidget):
         self.game_started = False  
         # Game board (grid)
         self.grid = QGridLayout()
-        for row in range(5):
-            for col in range(5):
-                btn = QPushButton(" ")
-                btn.setFixedSize(80, 80)
-                btn.clicked.connect(lambda _, r=row, c=col:  self.button_clicked(r, c))
-                self.buttons[row][col] = btn
-                self.grid.addWidget(btn, row, col)
+        self.build_grid(BOARD_SIZE)
         main_layout.addLayout(self.grid)
 
         # Status
@@ -95,6 +123,37 @@ class TicTacToeUI(QWidget):
         main_layout.addWidget(self.status_label)
 
         self.setLayout(main_layout)
+
+    def update_win_lengths(self):
+        """Offer 3 up to the board size in a row, five in a row by default"""
+        size = BOARD_SIZES[self.size_choice.currentIndex()]
+        self.win_choice.clear()
+        self.win_choice.addItems([str(length) for length in range(3, size + 1)])
+        self.win_choice.setCurrentText(str(min(size, 5)))
+
+    def build_grid(self, size):
+        """Replace the board buttons with a size x size grid that fits the window"""
+        for row in self.buttons:
+            for btn in row:
+                self.grid.removeWidget(btn)
+                btn.deleteLater()
+        self.buttons = [[None] * size for _ in range(size)]
+        cell_size = min(80, 480 // size)
+        self.mark_style = f"font-weight: bold; font-size: {cell_size // 2}px;"
+        for row in range(size):
+            for col in range(size):
+                btn = QPushButton(" ")
+                btn.setFixedSize(cell_size, cell_size)
+                btn.clicked.connect(lambda _, r=row, c=col:  self.button_clicked(r, c))
+                self.buttons[row][col] = btn
+                self.grid.addWidget(btn, row, col)
+
+    def new_board(self):
+        """Empty board with the rules picked in the boxes, resizing the grid if needed"""
+        size = BOARD_SIZES[self.size_choice.currentIndex()]
+        self.board = BitBoard.empty(size, int(self.win_choice.currentText()))
+        if len(self.buttons) != size:
+            self.build_grid(size)
 #================================================================================================================
     def button_clicked(self, row, col):
      if not self.game_started :
@@ -121,12 +180,15 @@ class TicTacToeUI(QWidget):
             )
             return
 
-        self.board = [[" "]*5 for _ in range(5)]
-        for row in range(5):
-            for col in range(5):
+        self.cancel_ai()
+        self.new_board()
+        clear_tables()  # cached positions are only reused within one game
+        for row in range(self.board.size):
+            for col in range(self.board.size):
                 self.buttons[row][col].setText(" ")
                 self.buttons[row][col].setEnabled(True)
         self.player_name = self.name_input.text()
+        start_new_game(self.player_name, self.algo_choice.currentText())
         self.current_turn = "Player"
         self.status_label.setText("Game Started! Your move.")
 #=======================================================================================
@@ -136,9 +198,12 @@ class TicTacToeUI(QWidget):
 
         self.name_input.clear() 
 
-        self.board = [[" "]*5 for _ in range(5)]
-        for row in range(5):
-            for col in range(5):
+        self.cancel_ai()
+        self.new_board()
+        clear_tables()
+        end_game()  # the abandoned game keeps no result
+        for row in range(self.board.size):
+            for col in range(self.board.size):
              self.buttons[row][col].setText(" ")
              self.buttons[row][col].setEnabled(True)
         self.buttons[row][col].setStyleSheet("color: white; font-weight: bold; font-size: 16px;")
@@ -148,71 +213,117 @@ class TicTacToeUI(QWidget):
 
 #==============================================================================================================
     def make_move(self, row, col):
-        if self.board[row][col] != " " or self.current_turn != "Player":
+        if self.board.get(row, col) != " " or self.current_turn != "Player":
             return
-        self.board[row][col] = "X"
+        self.board.place(row, col, "X")
         self.buttons[row][col].setText("X")
-        self.buttons[row][col].setStyleSheet("color: red; font-weight: bold; font-size: 40px;")
+        self.buttons[row][col].setStyleSheet("color: red; " + self.mark_style)
         self.buttons[row][col].setEnabled(False)
         self.current_turn = "AI"
         self.status_label.setText("AI is thinking...")
         self.update()
 
           # Check if the player won
-        if check_winner(self.board, "X"):
+        if self.board.is_winning_move(row, col):
             self.game_over("You win!")
             save_result(self.player_name, "Win")
             QMessageBox.information(self, "Game Over", "You win!")
             return
-        elif not get_empty_cells(self.board):
+        elif self.board.is_drawn():
             self.game_over("It's a draw!")
             save_result(self.player_name, "Draw")
             QMessageBox.information(self, "Game Over", "Draw!")
             return
 
-        # AI's turn
-        selected_algo = self.algo_choice.currentText()
-        start_time = time.time()
-        if selected_algo == "Minimax":
-            ai_move = get_best_move_minimax(self.board, "O")
-            algo_name = "Minimax"
-        elif selected_algo == "Alpha-Beta":
-            ai_move = get_best_move_alpha_beta(self.board, "O")
-            algo_name = "Alpha-Beta"
-        else:
-            ai_move = None
-            algo_name = "None"  # Should not happen
+        # AI's turn, searched on a worker thread so the window keeps repainting
+        algo_name = self.algo_choice.currentText()
+        ai_function = AI_ENGINES.get(algo_name)
+        if ai_function is None:
+            self.status_label.setText("AI couldn't make a move (Error).")
+            return
+        self.ai_worker = AIMoveWorker(self.board, ai_function, algo_name,
+                                      ponder_worker=self.hand_over_pondering(algo_name))
+        self.ai_worker.progress.connect(self.ai_progress)
+        self.ai_worker.move_ready.connect(self.ai_moved)
+        self.ai_worker.start()
+
+    def ai_progress(self, depth, nodes):
+        if self.sender() is self.ai_worker:
+            self.status_label.setText(f"AI is thinking... depth {depth}, {nodes} nodes searched")
 
-        move_time = time.time() - start_time
+    def ai_moved(self, ai_move, algo_name, move_time):
+        if self.sender() is not self.ai_worker:
+            return  # the game was reset while this search was running
+        self.ai_worker.wait()  # run() returns right after emitting
+        self.ai_worker = None
 
         if ai_move:
             ai_row, ai_col = ai_move
-            self.board[ai_row][ai_col] = "O"
+            self.board.place(ai_row, ai_col, "O")
             self.buttons[ai_row][ai_col].setText("O")
-            self.buttons[ai_row][ai_col].setStyleSheet("color: yellow; font-weight: bold; font-size: 40px;")
+            self.buttons[ai_row][ai_col].setStyleSheet("color: yellow; " + self.mark_style)
             self.buttons[ai_row][ai_col].setEnabled(False)
             save_move_time(self.player_name, algo_name, move_time)
 
             # Check if AI won
-            if check_winner(self.board, "O"):
+            if self.board.is_winning_move(ai_row, ai_col):
                 self.game_over("AI wins!")
                 save_result(self.player_name, "Loss")
                 QMessageBox.information(self, "Game Over", "You Loss")
                 return
-            elif not get_empty_cells(self.board):
+            elif self.board.is_drawn():
                 self.game_over("It's a draw!")
-                save_result(self.player_name, "Draw the Match")
+                save_result(self.player_name, "Draw")
                 return
 
             self.current_turn = "Player"
             self.status_label.setText("Your turn.")
+            if self.ponder_check.isChecked():
+                self.start_pondering(algo_name)
         else:
             self.status_label.setText("AI couldn't make a move (Error).")
 
+    def start_pondering(self, algo_name):
+        self.stop_pondering()
+        self.ponder_worker = PonderWorker(self.board, AI_ENGINES[algo_name], algo_name)
+        self.ponder_worker.start()
+
+    def hand_over_pondering(self, algo_name):
+        """
+        Pass the ponder worker on to the AI move, which takes its answer for the
+        current board. On a miss the search still starts from the tables
+        pondering filled. Pondering for another engine is stopped instead.
+        """
+        worker = self.ponder_worker
+        self.ponder_worker = None
+        if worker is not None and worker.algo_name != algo_name:
+            worker.stop()
+            return None
+        return worker
+
+    def stop_pondering(self):
+        if self.ponder_worker is not None:
+            self.ponder_worker.stop()
+            self.ponder_worker = None
+
+    def cancel_ai(self):
+        """Stop the AI's search and pondering; a cancelled move is never played"""
+        if self.ai_worker is not None:
+            self.ai_worker.cancel()
+            self.ai_worker = None
+            self.game_started = False
+            self.status_label.setText("AI move cancelled. Press 'Start Game' to play again.")
+        self.stop_pondering()
+
+    def closeEvent(self, event):
+        self.cancel_ai()
+        super().closeEvent(event)
+
     def game_over(self, message):
+        self.stop_pondering()
         self.status_label.setText(message)
-        for row in range(5):
-            for col in range(5):
+        for row in range(self.board.size):
+            for col in range(self.board.size):
                 self.buttons[row][col].setEnabled(False)
 
         # TODO: Hook AI move here in next step
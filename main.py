@@ -115,10 +115,18 @@ class MainMenuWindow(QMainWindow):
     def create_game_page(self):
         self.game_widget = TicTacToeUI()
         back_btn = QPushButton("Back to Main Menu")
-        back_btn.clicked.connect(lambda: self.stacked_widget.setCurrentIndex(0))
+        back_btn.clicked.connect(self.leave_game)
         self.game_widget.layout().addWidget(back_btn)
         self.stacked_widget.addWidget(self.game_widget)
 
+    def leave_game(self):
+        self.game_widget.cancel_ai()
+        self.stacked_widget.setCurrentIndex(0)
+
+    def closeEvent(self, event):
+        self.game_widget.cancel_ai()
+        super().closeEvent(event)
+
     def create_stats_page(self):
         stats_widget = QWidget()
         stats_layout = QVBoxLayout(stats_widget)
@@ -0,0 +1,61 @@
+# move_ordering.py
+from utils import DEFAULT_LINES
+
+_cell_orders = {}
+
+
+def cell_order(lines=DEFAULT_LINES):
+    """Every cell of the board as a single-bit mask, most winning lines through it first"""
+    order = _cell_orders.get(lines)
+    if order is None:
+        order = _cell_orders[lines] = tuple(static_order(lines.line_indices, lines))
+    return order
+
+
+def static_order(moves, lines=DEFAULT_LINES):
+    """Sort single-bit moves by the number of lines through them (stable)"""
+    through = lines.line_indices
+    return sorted(moves, key=lambda bit: -len(through[bit]))
+
+
+# Number of winning lines through each cell: 4 for the centre, 3 for the other
+# diagonal cells and 2 for the rest. Cells on more lines are tried first.
+LINE_COUNTS = {bit: len(indices) for bit, indices in DEFAULT_LINES.line_indices.items()}
+STATIC_ORDER = cell_order()
+
+
+class MoveOrderer:
+    """
+    Per-search move ordering state for alpha-beta:
+    hash move first, then the two killer moves for the ply, then the rest
+    by history score with the static line-count order breaking ties.
+    """
+
+    def __init__(self, max_ply=None, lines=DEFAULT_LINES):
+        self.cells = cell_order(lines)
+        if max_ply is None:
+            max_ply = lines.cell_count
+        self.killers = [[None, None] for _ in range(max_ply + 1)]
+        # One history table per side: index 0 maximizing, 1 minimizing
+        self.history = ({bit: 0 for bit in self.cells}, {bit: 0 for bit in self.cells})
+
+    def order(self, empty, ply, side, hash_move=None):
+        history = self.history[side]
+        moves = sorted((bit for bit in self.cells if empty & bit),
+                       key=history.__getitem__, reverse=True)
+
+        front = []
+        for bit in (hash_move, *self.killers[ply]):
+            if bit is not None and empty & bit and bit not in front:
+                front.append(bit)
+        if not front:
+            return moves
+        return front + [bit for bit in moves if bit not in front]
+
+    def record_cutoff(self, bit, ply, side, remaining):
+        """Remember a move that caused a beta cutoff"""
+        killers = self.killers[ply]
+        if killers[0] != bit:
+            killers[1] = killers[0]
+            killers[0] = bit
+        self.history[side][bit] += remaining * remaining
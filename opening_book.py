@@ -0,0 +1,180 @@
+# opening_book.py
+import argparse
+import mmap
+import os
+import struct
+import time
+from utils import BitBoard, BOARD_SIZE, CELL_COUNT, DEFAULT_LINES, bit_to_cell, iter_bits, to_bitboard
+from symmetry import canonical_form, transform_bits, INVERSE
+from transposition import clear_tables
+from ai_alpha_beta import get_best_move_alpha_beta
+
+BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "opening_book.bin")
+
+# Positions with up to this many stones are put in the book by default
+BOOK_PLIES = 3
+# Each book move gets a much larger budget than a move in a live game
+BOOK_NODE_LIMIT = 100_000
+
+# File layout: header, then an open-addressing hash table of 2**slot_bits
+# slots stored as one array of 8-byte keys followed by one array of 1-byte
+# moves. A key is the packed canonical position plus one, so 0 marks a free
+# slot; the move is the cell index in the canonical orientation.
+_MAGIC = b"TTOB"
+_VERSION = 1
+_HEADER = struct.Struct("<4sBBBx")
+_KEY = struct.Struct("<Q")
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+
+
+def pack_position(x_bits, o_bits):
+    return x_bits | o_bits << CELL_COUNT
+
+
+def side_to_move(board):
+    """X moves first, so X is to move whenever both players have as many stones"""
+    return "X" if bin(board.x).count("1") == bin(board.o).count("1") else "O"
+
+
+def _slot(key, slot_bits):
+    return (key * _HASH_MULTIPLIER & 0xFFFFFFFFFFFFFFFF) >> (64 - slot_bits)
+
+
+def canonical_positions(max_plies):
+    """Yield every canonical (x, o) position reachable in at most max_plies moves"""
+    layer = {(0, 0)}
+    for ply in range(max_plies + 1):
+        yield from sorted(layer)
+        if ply == max_plies:
+            return
+        next_layer = set()
+        for x, o in layer:
+            empty = (1 << CELL_COUNT) - 1 & ~(x | o)
+            for bit in iter_bits(empty):
+                if ply % 2 == 0:
+                    next_layer.add(canonical_form(x | bit, o)[:2])
+                else:
+                    next_layer.add(canonical_form(x, o | bit)[:2])
+        layer = next_layer
+
+
+def build_book(max_plies=BOOK_PLIES, node_limit=BOOK_NODE_LIMIT, progress=None):
+    """
+    Search every canonical position up to max_plies; returns {packed position: cell index}.
+    progress(done, total) is called after each position.
+    """
+    positions = list(canonical_positions(max_plies))
+    entries = {}
+    for done, (x, o) in enumerate(positions, 1):
+        clear_tables()  # each entry is searched from scratch, so the book is reproducible
+        board = BitBoard(x, o)
+        row, col = get_best_move_alpha_beta(board, side_to_move(board), node_limit=node_limit)
+        entries[pack_position(x, o)] = row * BOARD_SIZE + col
+        if progress is not None:
+            progress(done, len(positions))
+    return entries
+
+
+def write_book(entries, path=BOOK_PATH, max_plies=BOOK_PLIES):
+    slot_bits = max(1, (2 * len(entries) - 1).bit_length())  # load factor at most 1/2
+    size = 1 << slot_bits
+    keys = [0] * size
+    moves = bytearray(size)
+    for position, move in entries.items():
+        stored = position + 1
+        slot = _slot(stored, slot_bits)
+        while keys[slot]:
+            slot = (slot + 1) & (size - 1)
+        keys[slot] = stored
+        moves[slot] = move
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, max_plies, slot_bits))
+        f.write(struct.pack(f"<{size}Q", *keys))
+        f.write(moves)
+
+
+class OpeningBook:
+    """
+    Read-only view of a book file. The file is memory-mapped, so opening it
+    costs nothing up front and each lookup reads the slots it probes.
+    """
+
+    def __init__(self, path=BOOK_PATH):
+        with open(path, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._data) < _HEADER.size:
+            self._data.close()
+            raise ValueError(f"{path} is too short to be an opening book")
+        magic, version, self.max_plies, self.slot_bits = _HEADER.unpack_from(self._data)
+        if magic != _MAGIC or version != _VERSION:
+            self._data.close()
+            raise ValueError(f"{path} is not a version {_VERSION} opening book")
+        # A file cut short would open fine and then fail on every lookup
+        if len(self._data) != _HEADER.size + (_KEY.size << self.slot_bits) + (1 << self.slot_bits):
+            self._data.close()
+            raise ValueError(f"{path} is damaged: its size doesn't match its header")
+        self._mask = (1 << self.slot_bits) - 1
+        self._moves_offset = _HEADER.size + (_KEY.size << self.slot_bits)
+
+    def lookup(self, x_bits, o_bits):
+        """Book move (row, col) for the position, or None if it is not in the book"""
+        cx, co, transform = canonical_form(x_bits, o_bits)
+        stored = pack_position(cx, co) + 1
+        slot = _slot(stored, self.slot_bits)
+        while True:
+            key = _KEY.unpack_from(self._data, _HEADER.size + slot * _KEY.size)[0]
+            if key == stored:
+                bit = 1 << self._data[self._moves_offset + slot]
+                return bit_to_cell(transform_bits(bit, INVERSE[transform]))
+            if not key:
+                return None
+            slot = (slot + 1) & self._mask
+
+    def close(self):
+        self._data.close()
+
+
+_book = None
+_book_checked = False
+
+
+def get_book():
+    """The shared OpeningBook, or None if no valid book file has been generated"""
+    global _book, _book_checked
+    if not _book_checked:
+        _book_checked = True
+        try:
+            _book = OpeningBook(BOOK_PATH)
+        except (OSError, ValueError):
+            _book = None
+    return _book
+
+
+def get_best_move_book(board, player, **limits):
+    """
+    Book move for player when the position is in the opening book, otherwise
+    get_best_move_alpha_beta with the same limits. The book only covers the
+    standard 5x5 game.
+    """
+    bitboard = to_bitboard(board)
+    book = get_book()
+    if book is not None and bitboard.lines is DEFAULT_LINES and player == side_to_move(bitboard):
+        move = book.lookup(bitboard.x, bitboard.o)
+        if move is not None:
+            return move
+    return get_best_move_alpha_beta(bitboard, player, **limits)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the opening book")
+    parser.add_argument("--plies", type=int, default=BOOK_PLIES)
+    parser.add_argument("--nodes", type=int, default=BOOK_NODE_LIMIT)
+    parser.add_argument("--output", default=BOOK_PATH)
+    args = parser.parse_args()
+
+    start_time = time.time()
+    entries = build_book(args.plies, args.nodes,
+                         progress=lambda done, total: print(f"\r{done}/{total} positions", end="", flush=True))
+    print()
+    write_book(entries, args.output, args.plies)
+    print(f"Wrote {len(entries)} positions to {args.output} in {time.time() - start_time:.1f}s")
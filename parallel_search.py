@@ -0,0 +1,123 @@
+# parallel_search.py
+import atexit
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import ai_alpha_beta
+import ai_minimax
+from utils import to_bitboard, iter_bits, BitBoard, get_line_table
+from symmetry import unique_moves
+from move_ordering import static_order
+from transposition import clear_tables, tables_game
+
+ENGINES = {
+    "minimax": (ai_minimax.get_best_move_minimax, ai_minimax.last_search_stats),
+    "alpha_beta": (ai_alpha_beta.get_best_move_alpha_beta, ai_alpha_beta.last_search_stats),
+}
+
+_pool = None
+_pool_workers = 0
+_shared_best = None   # best root score found so far, shared with the workers
+_worker_game = None   # the parent's tables_game() that this worker's tables were filled in
+
+# Counters from the most recent call, summed over workers
+last_search_stats = {}
+
+
+def _init_worker(shared_best):
+    global _shared_best
+    _shared_best = shared_best
+
+
+def _search_root_move(engine, x_bits, o_bits, rules, player, cell, game):
+    """
+    Worker task: score one root move, starting from the shared best bound.
+    game is the parent's tables_game(); the worker's own tables are cleared
+    when it changes, so like the parent's they only last one game.
+    """
+    global _worker_game
+    if game != _worker_game:
+        clear_tables()
+        _worker_game = game
+    search, stats = ENGINES[engine]
+    board = BitBoard(x_bits, o_bits, get_line_table(*rules))
+    if engine == "alpha_beta":
+        # One below the best so far: a move that only ties it still gets an
+        # exact score, so ties break by root order just like the serial search
+        search(board, player, root_moves=[cell], root_alpha=_shared_best.value - 1)
+    else:
+        search(board, player, root_moves=[cell])
+    score = stats["score"]
+
+    with _shared_best.get_lock():
+        if score > _shared_best.value:
+            _shared_best.value = score
+    return score, stats["nodes"]
+
+
+def get_pool(workers=None):
+    """Create the worker pool on first use and reuse it for later moves"""
+    global _pool, _pool_workers, _shared_best
+    workers = workers or os.cpu_count() or 1
+    if _pool is not None and _pool_workers != workers:
+        shutdown_pool()
+    if _pool is None:
+        _shared_best = multiprocessing.Value("d", -float("inf"))
+        _pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                    initargs=(_shared_best,))
+        _pool_workers = workers
+    return _pool
+
+
+def shutdown_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True)
+        _pool = None
+
+
+atexit.register(shutdown_pool)
+
+
+def get_best_move_parallel(board, player, engine="alpha_beta", workers=None):
+    """
+    Fixed-depth search with the root moves split across worker processes.
+    Returns the same move as the serial engine: the first move, in the serial
+    root order, with the highest score. Scores must be integers.
+    """
+    opponent = "X" if player == "O" else "O"
+    bitboard = to_bitboard(board)
+    lines = bitboard.lines
+    own = bitboard.bits(player)
+    other = bitboard.bits(opponent)
+    empty = lines.full_mask & ~(own | other)
+    root_moves = unique_moves(own, other, iter_bits(empty & lines.live_cells(own, other) or empty), lines.size)
+    if engine == "alpha_beta":
+        root_moves = static_order(root_moves, lines)
+    if not root_moves:
+        return None
+
+    pool = get_pool(workers)
+    with _shared_best.get_lock():
+        _shared_best.value = -float("inf")
+
+    # Line tables are rebuilt in the workers rather than pickled
+    rules = (lines.size, lines.win_length)
+    game = tables_game()
+    futures = [pool.submit(_search_root_move, engine, bitboard.x, bitboard.o, rules, player,
+                           lines.bit_to_cell(bit), game)
+               for bit in root_moves]
+    best_score = -float("inf")
+    best_bit = None
+    nodes = 0
+    for bit, future in zip(root_moves, futures):
+        score, move_nodes = future.result()
+        nodes += move_nodes
+        if score > best_score:
+            best_score = score
+            best_bit = bit
+
+    last_search_stats.clear()
+    last_search_stats.update({"score": best_score, "nodes": nodes, "workers": _pool_workers})
+    return lines.bit_to_cell(best_bit)
@@ -4,10 +4,9 @@ import numpy as np
 import sqlite3
 import pandas as pd
 import time
-import random
 from ai_minimax import get_best_move_minimax
 from ai_alpha_beta import get_best_move_alpha_beta
-from utils import check_winner, get_empty_cells
+from playout_simulator import random_positions
 
 class PerformanceAnalyzer:
     def __init__(self, db_path="tic_tac_toe.db"):
@@ -29,26 +28,13 @@ class PerformanceAnalyzer:
         # Track move times for both algorithms
         minimax_times = []
         alphabeta_times = []
-        
-        for game_round in range(1, num_games + 1):
+
+        # Board states after 3 to 8 random moves, played for all rounds at once
+        boards = random_positions(num_games, 3, 8)
+
+        for game_round, board in enumerate(boards, 1):
             print(f"Game round {game_round}/{num_games}")
             
-            # Create a new game board
-            board = [[" " for _ in range(5)] for _ in range(5)]
-            
-            # Make some random moves to create different board states
-            num_initial_moves = random.randint(3, 8)
-            players = ["X", "O"]
-            
-            for _ in range(num_initial_moves):
-                empty_cells = get_empty_cells(board)
-                if not empty_cells:
-                    break
-                    
-                row, col = random.choice(empty_cells)
-                player = players[_ % 2]
-                board[row][col] = player
-            
             # Test both algorithms on the same board state
             # Measure Minimax time
             start_time = time.time()
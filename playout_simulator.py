@@ -0,0 +1,155 @@
+# playout_simulator.py
+import numpy as np
+from utils import DEFAULT_LINES, BitBoard
+
+_line_matrices = {}
+
+
+def line_matrix(lines=DEFAULT_LINES):
+    """
+    LINE_MATRIX for the rules of lines: entry [cell, line] is 1 when the
+    cell lies on the line, so a (N, cells) stone array times it gives every
+    board's stone count on every line.
+    """
+    matrix = _line_matrices.get(lines)
+    if matrix is None:
+        matrix = _line_matrices[lines] = np.array(
+            [[line >> cell & 1 for line in lines.win_masks] for cell in range(lines.cell_count)],
+            dtype=np.float32)
+    return matrix
+
+
+LINE_MATRIX = line_matrix()
+
+# Per-board results
+ONGOING, X_WINS, O_WINS, DRAW = 0, 1, 2, 3
+
+
+def _cells(bits, cell_count):
+    return np.array([bits >> cell & 1 for cell in range(cell_count)], dtype=np.float32)
+
+
+def _to_bits(stones):
+    """Bitboard of each row of a stone array, as Python ints so any board size fits"""
+    return [sum(1 << int(cell) for cell in np.flatnonzero(row)) for row in stones]
+
+
+class PlayoutSimulator:
+    """
+    N boards playing random moves in lock-step. The stones are held as two
+    (N, cells) arrays of 0/1, and a move on every ongoing board costs one
+    random draw, one argmax and a few products with the line matrix.
+    Moves are drawn from the empty cells on live lines, like the playouts
+    in ai_mcts. A game ends on a completed line or, as in the game loops,
+    once every line holds both players' stones. lines gives the rules
+    (5x5, five in a row by default).
+    """
+
+    def __init__(self, count, x_bits=0, o_bits=0, to_move="X", seed=None, lines=DEFAULT_LINES):
+        self.lines = lines
+        self.matrix = line_matrix(lines)
+        self.x = np.tile(_cells(x_bits, lines.cell_count), (count, 1))
+        self.o = np.tile(_cells(o_bits, lines.cell_count), (count, 1))
+        # Stones per line for each player, kept up to date by step()
+        self.x_counts = self.x @ self.matrix
+        self.o_counts = self.o @ self.matrix
+        self.x_to_move = np.full(count, to_move == "X")
+        # A starting position may already be won or dead
+        x_won = (self.x_counts == lines.win_length).any(axis=1)
+        o_won = (self.o_counts == lines.win_length).any(axis=1)
+        dead = ((self.x_counts > 0) & (self.o_counts > 0)).all(axis=1)
+        self.result = np.where(x_won, X_WINS, np.where(o_won, O_WINS, np.where(dead, DRAW, ONGOING)))
+        self.result = self.result.astype(np.int8)
+        self.moves_played = np.zeros(count, dtype=np.int32)
+        # seed may also be an existing np.random.Generator to share
+        self.rng = np.random.default_rng(seed)
+
+    def __len__(self):
+        return len(self.result)
+
+    def step(self, mask=None):
+        """
+        Play one random move on every ongoing board, or on the ongoing boards
+        selected by the boolean array mask. Returns the number of moves made.
+        """
+        moving = self.result == ONGOING
+        if mask is not None:
+            moving &= mask
+        index = np.flatnonzero(moving)
+        if not len(index):
+            return 0
+
+        x = self.x[index]
+        o = self.o[index]
+        # Empty cells on a line without stones of both players; an ongoing
+        # board always has one
+        live = ((self.x_counts[index] == 0) | (self.o_counts[index] == 0)).astype(np.float32)
+        open_cells = (live @ self.matrix.T > 0) & (x + o == 0)
+        # A random key per cell, with every other cell pushed below the open ones
+        keys = self.rng.random(x.shape)
+        keys[~open_cells] = -1.0
+        cells = keys.argmax(axis=1)
+        x_turn = self.x_to_move[index]
+        rows = np.arange(len(index))
+        x[rows[x_turn], cells[x_turn]] = 1
+        o[rows[~x_turn], cells[~x_turn]] = 1
+        self.x[index] = x
+        self.o[index] = o
+
+        x_counts = self.x_counts[index] = x @ self.matrix
+        o_counts = self.o_counts[index] = o @ self.matrix
+        own_counts = np.where(x_turn[:, None], x_counts, o_counts)
+        won = (own_counts == self.lines.win_length).any(axis=1)
+        dead = ((x_counts > 0) & (o_counts > 0)).all(axis=1)
+        self.result[index] = np.where(won, np.where(x_turn, X_WINS, O_WINS),
+                                      np.where(dead, DRAW, ONGOING))
+        self.x_to_move[index] = ~x_turn
+        self.moves_played[index] += 1
+        return len(index)
+
+    def run(self):
+        """Play every board to the end; returns the result array"""
+        while self.step():
+            pass
+        return self.result
+
+    def bitboards(self, index=None):
+        """BitBoards for the boards at index (all boards by default)"""
+        if index is None:
+            index = np.arange(len(self))
+        return [BitBoard(x, o, self.lines)
+                for x, o in zip(_to_bits(self.x[index]), _to_bits(self.o[index]))]
+
+
+def random_positions(count, min_moves, max_moves=None, seed=None, lines=DEFAULT_LINES):
+    """
+    count undecided positions reached by random play from the empty board,
+    each after a random number of moves between min_moves and max_moves.
+    """
+    if max_moves is None:
+        max_moves = min_moves
+    rng = np.random.default_rng(seed)
+    positions = []
+    while len(positions) < count:
+        simulator = PlayoutSimulator(count, seed=rng, lines=lines)
+        targets = rng.integers(min_moves, max_moves + 1, size=count)
+        while simulator.step(simulator.moves_played < targets):
+            pass
+        ongoing = np.flatnonzero(simulator.result == ONGOING)
+        positions.extend(simulator.bitboards(ongoing))
+    return positions[:count]
+
+
+def playout_rewards(mover, waiting, mover_player, count, seed=None, lines=DEFAULT_LINES):
+    """
+    Play count random games from one position and return the summed result
+    for the side not to move: 1 per win, 0.5 per draw, 0 per loss.
+    """
+    if mover_player == "X":
+        simulator = PlayoutSimulator(count, mover, waiting, "X", seed, lines)
+        waiting_wins = O_WINS
+    else:
+        simulator = PlayoutSimulator(count, waiting, mover, "O", seed, lines)
+        waiting_wins = X_WINS
+    result = simulator.run()
+    return float(np.count_nonzero(result == waiting_wins) + 0.5 * np.count_nonzero(result == DRAW))
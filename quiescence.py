@@ -0,0 +1,42 @@
+# quiescence.py
+from evaluation import WIN_SCORE
+
+# Most forcing moves one horizon node may be extended by
+QUIESCENCE_NODE_LIMIT = 32
+
+
+def quiescence(position, depth, side, node_limit=QUIESCENCE_NODE_LIMIT):
+    """
+    Score of a SearchBoard at the search horizon for side, the side to move,
+    at node depth. Instead of stopping in the middle of a forced sequence it
+    keeps playing forcing moves: a side with a winning cell wins, a side
+    facing two threats loses, and a side facing one threat blocks it. Only
+    a quiet position (or node_limit blocks) gets the static score.
+    Returns (score, number of blocks played).
+    """
+    played = []
+    try:
+        while True:
+            if position.winning_cells(side):
+                score = WIN_SCORE - depth - 1
+                break
+            threats = position.winning_cells(1 - side)
+            if threats & (threats - 1):
+                # Two cells to block: the other side wins with its next move
+                score = depth + 2 - WIN_SCORE
+                break
+            if not position.live_lines:
+                score = 0
+                break
+            if not threats or len(played) >= node_limit:
+                score = -position.score if side else position.score
+                break
+            position.make_move(threats, side)
+            played.append((threats, side))
+            depth += 1
+            side = 1 - side
+    finally:
+        for bit, mover in reversed(played):
+            position.unmake_move(bit, mover)
+    # The score is for the side to move where the sequence stopped
+    return (-score if len(played) % 2 else score), len(played)
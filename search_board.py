@@ -0,0 +1,158 @@
+# search_board.py
+from utils import BOARD_SIZE, DEFAULT_LINES, iter_bits
+from evaluation import count_scores
+
+# On boards bigger than the standard one, only cells at most this many rows
+# and columns from a stone are searched unless the engines are told otherwise
+PROXIMITY_DISTANCE = 1
+
+
+def default_proximity(lines):
+    return PROXIMITY_DISTANCE if lines.size > BOARD_SIZE else 0
+
+
+class SearchBoard:
+    """
+    Mutable board for the engines. Sides are 0 and 1 (side 0 is the player
+    the engine searches for). make_move/unmake_move keep the stone count of
+    each side on every line, the empty cells and the line evaluation up to
+    date by touching only the lines through the cell played.
+
+    A line holding stones of both sides is dead: nobody can win it. The board
+    tracks how many lines are still live and which cells lie on one; cells
+    on dead lines only are never worth playing, and with no live line left
+    the game is a draw.
+
+    lines is the LineTable of the rules being played (5x5, five in a row
+    by default). With a proximity distance, moves() only offers cells that
+    many rows and columns from a stone (the centre on an empty board); the
+    stones near each cell are counted as moves are made and unmade.
+    """
+
+    __slots__ = ("bits", "counts", "empty", "empty_count", "score", "live_lines", "live_cells",
+                 "lines", "through", "line_length", "count_scores", "neighbours", "near_counts", "near")
+
+    def __init__(self, own=0, other=0, lines=DEFAULT_LINES, proximity=0):
+        self.lines = lines
+        self.through = lines.line_indices
+        self.line_length = lines.win_length
+        self.count_scores = count_scores(lines.win_length)
+        self.bits = [own, other]
+        self.counts = ([bin(own & line).count("1") for line in lines.win_masks],
+                       [bin(other & line).count("1") for line in lines.win_masks])
+        self.empty = lines.full_mask & ~(own | other)
+        self.empty_count = bin(self.empty).count("1")
+        # Evaluation from side 0's point of view
+        self.score = sum(self.count_scores[a][b] for a, b in zip(*self.counts))
+        self._update_live()
+
+        self.neighbours = lines.neighbours(proximity) if proximity else None
+        self.near_counts = None
+        self.near = 0
+        if self.neighbours is not None:
+            self.near_counts = dict.fromkeys(self.neighbours, 0)
+            for bit in iter_bits(own | other):
+                self._add_near(bit)
+
+    def _add_near(self, bit):
+        counts = self.near_counts
+        for cell in self.neighbours[bit]:
+            if not counts[cell]:
+                self.near |= cell
+            counts[cell] += 1
+
+    def _remove_near(self, bit):
+        counts = self.near_counts
+        for cell in self.neighbours[bit]:
+            counts[cell] -= 1
+            if not counts[cell]:
+                self.near ^= cell
+
+    def _update_live(self):
+        live_lines = 0
+        live_cells = 0
+        for line, own, other in zip(self.lines.win_masks, *self.counts):
+            if not (own and other):
+                live_lines += 1
+                live_cells |= line
+        self.live_lines = live_lines
+        self.live_cells = live_cells
+
+    def make_move(self, bit, side):
+        """Place side's stone on bit; returns True if it completes a line"""
+        own_counts = self.counts[side]
+        other_counts = self.counts[1 - side]
+        scores = self.count_scores
+        score = self.score
+        won = False
+        killed = False
+        for line in self.through[bit]:
+            own = own_counts[line]
+            other = other_counts[line]
+            if side:
+                score += scores[other][own + 1] - scores[other][own]
+            else:
+                score += scores[own + 1][other] - scores[own][other]
+            own_counts[line] = own + 1
+            if own + 1 == self.line_length:
+                won = True
+            elif not own and other:
+                killed = True
+        self.score = score
+        self.bits[side] |= bit
+        self.empty ^= bit
+        self.empty_count -= 1
+        if killed:
+            self._update_live()
+        if self.neighbours is not None:
+            self._add_near(bit)
+        return won
+
+    def unmake_move(self, bit, side):
+        own_counts = self.counts[side]
+        other_counts = self.counts[1 - side]
+        scores = self.count_scores
+        score = self.score
+        revived = False
+        for line in self.through[bit]:
+            own = own_counts[line] - 1
+            other = other_counts[line]
+            if side:
+                score += scores[other][own] - scores[other][own + 1]
+            else:
+                score += scores[own][other] - scores[own + 1][other]
+            own_counts[line] = own
+            if not own and other:
+                revived = True
+        self.score = score
+        self.bits[side] ^= bit
+        self.empty |= bit
+        self.empty_count += 1
+        if revived:
+            self._update_live()
+        if self.neighbours is not None:
+            self._remove_near(bit)
+
+    def moves(self):
+        """
+        Empty cells that still lie on a live line, narrowed to the cells near
+        stones when a proximity distance is set and any of those are left
+        """
+        moves = self.empty & self.live_cells
+        if self.neighbours is not None:
+            near = moves & (self.near or self.lines.centre)
+            if near:
+                return near
+        return moves
+
+    def winning_cells(self, side):
+        """Empty cells that would complete a line for side"""
+        target = self.line_length - 1
+        cells = 0
+        for line, own, other in zip(self.lines.win_masks, self.counts[side], self.counts[1 - side]):
+            if own == target and not other:
+                cells |= line
+        return cells & self.empty
+
+    def has_line(self, side):
+        return self.line_length in self.counts[side]
@@ -0,0 +1,78 @@
+# search_control.py
+import time
+from evaluation import WIN_THRESHOLD
+
+# Per-move budget used by the interactive game loops
+DEFAULT_TIME_LIMIT_MS = 1000
+
+# How many nodes to visit between clock reads
+_CLOCK_INTERVAL = 256
+
+
+class SearchTimeout(Exception):
+    """Raised inside a search when its time or node budget runs out"""
+
+
+class SearchLimits:
+    """
+    Time and node budget for one call to an engine.
+    count_node() is called once per node and raises SearchTimeout when
+    either budget is exhausted; without limits it only counts.
+    stop_event (a threading.Event) lets another thread abort the search;
+    the engine then returns the best move of its last completed depth.
+    progress, if given, is called as
+    progress(depth, nodes) each time iterative deepening completes a depth.
+    """
+
+    def __init__(self, time_limit_ms=None, node_limit=None, stop_event=None, progress=None):
+        self.started = time.perf_counter()
+        self.deadline = None if time_limit_ms is None else self.started + time_limit_ms / 1000
+        self.node_limit = node_limit
+        self.stop_event = stop_event
+        self.progress = progress
+        self.nodes = 0
+
+    @property
+    def bounded(self):
+        return self.deadline is not None or self.node_limit is not None
+
+    @property
+    def interruptible(self):
+        """True when the search can stop early, so it must deepen iteratively"""
+        return self.bounded or self.stop_event is not None
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def count_node(self):
+        self.nodes += 1
+        if self.node_limit is not None and self.nodes > self.node_limit:
+            raise SearchTimeout()
+        if self.nodes % _CLOCK_INTERVAL == 0:
+            self.check_clock()
+
+    def check_clock(self):
+        """Raise SearchTimeout if the deadline has passed or a stop was requested"""
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise SearchTimeout()
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise SearchTimeout()
+
+
+def iterative_deepening(search_root, max_depth, limits):
+    """
+    Run search_root(depth) for depth = 0, 1, ... max_depth and return the
+    (move, score) of the last depth that finished before the budget ran out.
+    Stops early once a forced win or loss has been proven.
+    """
+    result = (None, None)
+    for depth in range(max_depth + 1):
+        try:
+            result = search_root(depth)
+        except SearchTimeout:
+            break
+        if limits.progress is not None:
+            limits.progress(depth, limits.nodes)
+        if result[1] is not None and abs(result[1]) >= WIN_THRESHOLD:
+            break
+    return result
@@ -0,0 +1,92 @@
+# symmetry.py
+from utils import BOARD_SIZE, DEFAULT_LINES, iter_bits
+from transposition import zobrist_hash
+
+# The 8 symmetries of the square (dihedral group D4) as (row, col) mappings
+# on a board whose last row/column index is n
+TRANSFORMS = (
+    lambda r, c, n: (r, c),          # identity
+    lambda r, c, n: (c, n - r),      # rotate 90
+    lambda r, c, n: (n - r, n - c),  # rotate 180
+    lambda r, c, n: (n - c, r),      # rotate 270
+    lambda r, c, n: (r, n - c),      # mirror left/right
+    lambda r, c, n: (n - r, c),      # mirror top/bottom
+    lambda r, c, n: (c, r),          # main diagonal
+    lambda r, c, n: (n - c, n - r),  # anti-diagonal
+)
+# Index of the transform that undoes each one
+INVERSE = (0, 3, 2, 1, 4, 5, 6, 7)
+
+
+def _build_bit_maps(size):
+    maps = []
+    for transform in TRANSFORMS:
+        mapping = {}
+        for index in range(size * size):
+            row, col = transform(*divmod(index, size), size - 1)
+            mapping[1 << index] = 1 << (row * size + col)
+        maps.append(mapping)
+    return tuple(maps)
+
+
+# For each board size and transform: single-bit cell mask -> image cell mask
+_bit_maps = {}
+
+
+def bit_maps(size=BOARD_SIZE):
+    maps = _bit_maps.get(size)
+    if maps is None:
+        maps = _bit_maps[size] = _build_bit_maps(size)
+    return maps
+
+
+BIT_MAPS = bit_maps()
+
+
+def transform_bits(bits, transform, size=BOARD_SIZE):
+    mapping = bit_maps(size)[transform]
+    result = 0
+    for bit in iter_bits(bits):
+        result |= mapping[bit]
+    return result
+
+
+def transform_cell(row, col, transform, size=BOARD_SIZE):
+    return TRANSFORMS[transform](row, col, size - 1)
+
+
+def canonical_form(x_bits, o_bits, size=BOARD_SIZE):
+    """
+    Smallest (x, o) pair over all 8 symmetries of the position.
+    Returns (x, o, transform) where transform maps the given position onto it.
+    """
+    best = (x_bits, o_bits, 0)
+    for transform in range(1, len(TRANSFORMS)):
+        tx = transform_bits(x_bits, transform, size)
+        if tx > best[0]:
+            continue
+        to = transform_bits(o_bits, transform, size)
+        if (tx, to) < best[:2]:
+            best = (tx, to, transform)
+    return best
+
+
+def canonical_hash(x_bits, o_bits, to_move, lines=DEFAULT_LINES):
+    """Zobrist key of the canonical form, plus the transform that produced it"""
+    cx, co, transform = canonical_form(x_bits, o_bits, lines.size)
+    return zobrist_hash(cx, co, to_move, lines), transform
+
+
+def unique_moves(own, other, moves, size=BOARD_SIZE):
+    """
+    Drop moves whose resulting position is a mirror image of an earlier one.
+    own/other are the mover's and the opponent's bits; order is preserved.
+    """
+    seen = set()
+    unique = []
+    for bit in moves:
+        form = canonical_form(own | bit, other, size)[:2]
+        if form not in seen:
+            seen.add(form)
+            unique.append(bit)
+    return unique
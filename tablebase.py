@@ -0,0 +1,172 @@
+# tablebase.py
+import atexit
+import sqlite3
+from utils import CELL_COUNT, FULL_MASK, bit_to_cell, completes_line, iter_bits, live_cells
+from evaluation import WIN_SCORE
+
+# Positions with at most this many empty cells are solved exactly
+TABLEBASE_EMPTY = 10
+# Inside a search a position is only solved on the spot when this small;
+# up to TABLEBASE_EMPTY it must have been solved already
+SEARCH_SOLVE_EMPTY = 8
+
+TABLEBASE_PATH = "tablebase.db"
+
+# Results from the point of view of the side to move
+WIN, DRAW, LOSS = 1, 0, -1
+
+# Solved positions keyed by mover | waiting << CELL_COUNT, where mover holds
+# the stones of the side to move. Values are (result, distance): distance is
+# the number of plies to the end of the game with best play, the winner
+# finishing as fast and the loser holding out as long as possible.
+_solved = {}
+# Rows solved since the last save(), written to disk in one transaction
+_unsaved = []
+_connection = None
+
+
+def position_key(mover, waiting):
+    return mover | waiting << CELL_COUNT
+
+
+def use_table(path):
+    """Keep solved positions in the table at path from now on"""
+    global TABLEBASE_PATH, _connection
+    save()
+    if _connection is not None:
+        _connection.close()
+        _connection = None
+    TABLEBASE_PATH = path
+
+
+def _get_connection():
+    global _connection
+    if _connection is None:
+        _connection = sqlite3.connect(TABLEBASE_PATH, check_same_thread=False)
+        _connection.execute('''
+        CREATE TABLE IF NOT EXISTS tablebase (
+            position INTEGER PRIMARY KEY,
+            result INTEGER NOT NULL,
+            distance INTEGER NOT NULL
+        )
+        ''')
+    return _connection
+
+
+def _rank(entry):
+    """Sort key for a side choosing between outcomes: fast wins, then draws, then slow losses"""
+    result, distance = entry
+    return (result, -distance if result == WIN else distance)
+
+
+def _moves(mover, waiting):
+    """Empty cells that still lie on a live line; none means the game is a dead draw"""
+    return FULL_MASK & ~(mover | waiting) & live_cells(mover, waiting)
+
+
+def _best_reply(mover, waiting):
+    """(bit, (result, distance)) of the best move, with every child already solved"""
+    best_bit = None
+    best = None
+    for bit in iter_bits(_moves(mover, waiting)):
+        if completes_line(mover | bit, bit):
+            return bit, (WIN, 1)
+        result, distance = _solved[position_key(waiting, mover | bit)]
+        entry = (-result, distance + 1)
+        if best is None or _rank(entry) > _rank(best):
+            best_bit, best = bit, entry
+    return best_bit, best
+
+
+def solve(mover, waiting):
+    """
+    Retrograde analysis of every position reachable from (mover, waiting).
+    The positions are gathered one ply at a time, then valued from the last
+    ply back to the first so that every child is known before its parent.
+    """
+    layers = [{(mover, waiting)}]
+    while layers[-1]:
+        next_layer = set()
+        for own, other in layers[-1]:
+            if position_key(own, other) in _solved:
+                continue  # solved before, along with everything after it
+            for bit in iter_bits(_moves(own, other)):
+                if not completes_line(own | bit, bit):
+                    next_layer.add((other, own | bit))
+        layers.append(next_layer)
+
+    for layer in reversed(layers):
+        for own, other in layer:
+            key = position_key(own, other)
+            if key in _solved:
+                continue
+            if _moves(own, other):
+                entry = _best_reply(own, other)[1]
+            else:
+                entry = (DRAW, 0)
+            _solved[key] = entry
+            _unsaved.append((key, *entry))
+    return _solved[position_key(mover, waiting)]
+
+
+def save():
+    """Write the positions solved since the last save to the table on disk"""
+    if _unsaved:
+        connection = _get_connection()
+        with connection:
+            connection.executemany("INSERT OR IGNORE INTO tablebase VALUES (?, ?, ?)", _unsaved)
+        _unsaved.clear()
+
+
+atexit.register(save)
+
+
+def _load(mover, waiting):
+    """Solved entry from memory or the table on disk, or None"""
+    key = position_key(mover, waiting)
+    entry = _solved.get(key)
+    if entry is None:
+        row = _get_connection().execute(
+            "SELECT result, distance FROM tablebase WHERE position = ?", (key,)).fetchone()
+        if row is not None:
+            entry = _solved[key] = row
+    return entry
+
+
+def probe_score(mover, waiting, depth):
+    """
+    Exact score of the position for its side to move, or None if it is not
+    solved yet and too big to solve in the middle of a search. depth is the
+    engines' node depth, so a win scores WIN_SCORE - depth - distance just
+    like one found by searching.
+    """
+    entry = _solved.get(position_key(mover, waiting))
+    if entry is None:
+        if bin(FULL_MASK & ~(mover | waiting)).count("1") > SEARCH_SOLVE_EMPTY:
+            return None
+        entry = solve(mover, waiting)
+    result, distance = entry
+    return result * (WIN_SCORE - depth - distance)
+
+
+def solved_move(mover, waiting):
+    """
+    Perfect move for the side to move and its (result, distance), solving the
+    position first if neither memory nor the table on disk has it.
+    """
+    if _load(mover, waiting) is None:
+        solve(mover, waiting)
+    else:
+        # A stored position has its whole future stored with it
+        for bit in iter_bits(_moves(mover, waiting)):
+            if not completes_line(mover | bit, bit):
+                _load(waiting, mover | bit)
+    bit, entry = _best_reply(mover, waiting)
+    save()
+    return bit_to_cell(bit), entry
+
+
+def clear():
+    """Forget the in-memory positions; the table on disk is kept"""
+    save()
+    _solved.clear()
@@ -2,9 +2,40 @@
 
 import unittest
 import copy
-from utils import check_winner, get_empty_cells
+from utils import (check_winner, get_empty_cells, BitBoard, WIN_MASKS, completes_line, LINES_THROUGH_CELL,
+                   iter_bits, live_cells, FULL_MASK, get_line_table)
 from ai_minimax import get_best_move_minimax
+import ai_minimax
+import ai_alpha_beta
 from ai_alpha_beta import get_best_move_alpha_beta
+import ai_pvs
+from ai_pvs import get_best_move_pvs
+import ai_mcts
+from ai_mcts import get_best_move_mcts
+from transposition import (TranspositionTable, zobrist_hash, piece_keys, get_table,
+                           clear_tables, tables_game, ZOBRIST_SIDE, EXACT, LOWER, UPPER)
+from search_control import SearchLimits, SearchTimeout
+import parallel_search
+from parallel_search import get_best_move_parallel, shutdown_pool
+from evaluation import evaluate, LINE_PATTERNS, WIN_SCORE
+from search_board import SearchBoard
+from quiescence import quiescence
+from move_ordering import MoveOrderer, STATIC_ORDER
+from symmetry import canonical_form, transform_bits, transform_cell, unique_moves, INVERSE
+from ai_worker import PonderWorker, AIMoveWorker, likely_replies
+import threading
+import subprocess
+import sys
+import multiprocessing
+import random
+import sqlite3
+import os
+import tempfile
+import opening_book
+import tablebase
+import database
+from playout_simulator import PlayoutSimulator, random_positions, playout_rewards, X_WINS, O_WINS, DRAW
+from opening_book import OpeningBook, build_book, write_book, canonical_positions, pack_position
 
 
 class TestGameLogic(unittest.TestCase):
@@ -108,5 +139,972 @@ class TestGameLogic(unittest.TestCase):
         self.assertEqual(get_empty_cells(board)[0], (4, 4))
 
 
+class TestBitBoard(unittest.TestCase):
+
+    def setUp(self):
+        self.board = [["X", " ", " ", " ", "O"],
+                      [" ", "X", " ", "O", " "],
+                      [" ", " ", "X", " ", " "],
+                      [" ", "O", " ", "X", " "],
+                      [" ", " ", " ", " ", " "]]
+
+    def test_round_trip(self):
+        bitboard = BitBoard.from_list(self.board)
+        self.assertEqual(bitboard.to_list(), self.board)
+        self.assertEqual(bitboard.get(0, 4), "O")
+
+    def test_twelve_winning_lines(self):
+        self.assertEqual(len(WIN_MASKS), 12)
+        self.assertTrue(all(bin(mask).count("1") == 5 for mask in WIN_MASKS))
+
+    def test_matches_list_helpers(self):
+        bitboard = BitBoard.from_list(self.board)
+        self.assertEqual(get_empty_cells(bitboard), get_empty_cells(self.board))
+        self.assertFalse(check_winner(bitboard, "X"))
+        bitboard.place(4, 4, "X")
+        self.assertTrue(check_winner(bitboard, "X"))
+        bitboard.clear(4, 4)
+        self.assertFalse(check_winner(bitboard, "X"))
+
+    def test_engines_accept_bitboard(self):
+        bitboard = BitBoard.from_list(self.board)
+        self.assertEqual(get_best_move_alpha_beta(bitboard, "O"), (4, 4))
+        self.assertEqual(get_best_move_minimax(bitboard, "O"), (4, 4))
+
+
+class TestTranspositionTable(unittest.TestCase):
+
+    def test_incremental_hash_matches_full_hash(self):
+        bitboard = BitBoard()
+        key = zobrist_hash(0, 0, "X")
+        for row, col, player in [(2, 2, "X"), (0, 1, "O"), (4, 3, "X")]:
+            bitboard.place(row, col, player)
+            key ^= piece_keys(player)[1 << (row * 5 + col)] ^ ZOBRIST_SIDE
+        self.assertEqual(key, zobrist_hash(bitboard.x, bitboard.o, "O"))
+
+    def test_bounds_flip_for_other_side(self):
+        table = TranspositionTable()
+        table.store(42, 2, 1, LOWER, sign=-1)
+        self.assertEqual(table.probe(42), (2, -1, UPPER, None))
+        self.assertEqual(table.probe(42, -1), (2, 1, LOWER, None))
+
+    def test_replacement_and_eviction(self):
+        table = TranspositionTable(max_entries=2)
+        table.store(1, 3, 0, EXACT)
+        table.store(1, 1, 1, EXACT)
+        self.assertEqual(table.probe(1)[0], 3)
+        table.new_search()
+        table.store(1, 1, 1, EXACT)
+        self.assertEqual(table.probe(1)[0], 1)
+        table.store(2, 1, 0, EXACT)
+        table.store(3, 1, 0, EXACT)
+        self.assertEqual(len(table), 2)
+        self.assertIsNone(table.probe(1))
+        self.assertEqual(table.evictions, 1)
+
+    def test_table_persists_between_moves(self):
+        clear_tables()
+        board = [["X", " ", " ", " ", " "],
+                 [" ", " ", " ", " ", " "],
+                 [" ", " ", "O", " ", " "],
+                 [" ", " ", " ", " ", " "],
+                 [" ", " ", " ", " ", "X"]]
+        move = get_best_move_alpha_beta(board, "O")
+        table = get_table("alpha_beta")
+        self.assertGreater(len(table), 0)
+        hits = table.hits
+        self.assertEqual(get_best_move_alpha_beta(board, "O"), move)
+        self.assertGreater(table.hits, hits)
+        clear_tables()
+        self.assertEqual(len(table), 0)
+
+
+class TestSymmetry(unittest.TestCase):
+
+    def setUp(self):
+        self.board = BitBoard.from_list([["X", "O", " ", " ", " "],
+                                         [" ", " ", " ", " ", " "],
+                                         [" ", " ", "X", " ", " "],
+                                         [" ", " ", " ", "O", " "],
+                                         [" ", " ", " ", " ", " "]])
+
+    def test_canonical_form_is_invariant(self):
+        expected = canonical_form(self.board.x, self.board.o)[:2]
+        for transform in range(8):
+            x = transform_bits(self.board.x, transform)
+            o = transform_bits(self.board.o, transform)
+            self.assertEqual(canonical_form(x, o)[:2], expected)
+            self.assertEqual(transform_bits(x, INVERSE[transform]), self.board.x)
+
+    def test_empty_board_has_six_distinct_openings(self):
+        all_moves = [1 << i for i in range(25)]
+        self.assertEqual(len(unique_moves(0, 0, all_moves)), 6)
+
+    def test_mirrored_board_reuses_root_result(self):
+        clear_tables()
+        move = get_best_move_alpha_beta(self.board, "X")
+        mirrored = BitBoard(transform_bits(self.board.x, 4), transform_bits(self.board.o, 4))
+        table = get_table("alpha_beta")
+        size = len(table)
+        self.assertEqual(get_best_move_alpha_beta(mirrored, "X"), transform_cell(*move, 4))
+        self.assertEqual(len(table), size)
+
+
+class TestIterativeDeepening(unittest.TestCase):
+
+    def setUp(self):
+        clear_tables()
+
+    def test_node_limit_raises(self):
+        limits = SearchLimits(node_limit=2)
+        limits.count_node()
+        limits.count_node()
+        with self.assertRaises(SearchTimeout):
+            limits.count_node()
+
+    def test_time_limited_search_returns_legal_move(self):
+        board = [[" "] * 5 for _ in range(5)]
+        board[2][2] = "X"
+        for engine in (get_best_move_minimax, get_best_move_alpha_beta):
+            move = engine(board, "O", time_limit_ms=50)
+            self.assertIn(move, get_empty_cells(board))
+
+    def test_tiny_node_budget_still_moves(self):
+        board = [[" "] * 5 for _ in range(5)]
+        self.assertIn(get_best_move_alpha_beta(board, "O", node_limit=1), get_empty_cells(board))
+
+    def test_budgeted_search_finds_win(self):
+        board = [[" ", " ", " ", " ", " "],
+                 [" ", " ", " ", " ", " "],
+                 ["O", "O", "O", "O", " "],
+                 ["X", "X", "X", " ", " "],
+                 ["X", " ", " ", " ", " "]]
+        self.assertEqual(get_best_move_alpha_beta(board, "O", time_limit_ms=500), (2, 4))
+        self.assertEqual(get_best_move_minimax(board, "O", node_limit=100000), (2, 4))
+
+
+class TestMoveOrdering(unittest.TestCase):
+
+    def test_centre_first(self):
+        self.assertEqual(STATIC_ORDER[0], 1 << 12)
+
+    def test_hash_move_and_killers_first(self):
+        orderer = MoveOrderer()
+        empty = (1 << 25) - 1
+        orderer.record_cutoff(1 << 3, 2, 0, 1)
+        moves = orderer.order(empty, 2, 0, hash_move=1 << 7)
+        self.assertEqual(moves[:3], [1 << 7, 1 << 3, 1 << 12])
+        self.assertEqual(len(moves), 25)
+
+    def test_ordering_keeps_result_and_reports_nodes(self):
+        board = [[" ", " ", " ", " ", " "],
+                 [" ", "O", " ", " ", " "],
+                 ["X", "X", "X", "X", " "],
+                 [" ", " ", "O", " ", " "],
+                 [" ", " ", " ", " ", " "]]
+        results = {}
+        for ordered in (False, True):
+            clear_tables()
+            move = get_best_move_alpha_beta(board, "O", move_ordering=ordered)
+            results[ordered] = (move, ai_alpha_beta.last_search_stats["nodes"])
+        self.assertEqual(results[True][0], (2, 4))
+        self.assertEqual(results[False][0], (2, 4))
+        self.assertGreater(results[True][1], 0)
+        # Ordering brings the cutoffs forward: about 800 nodes against 6900 without it
+        self.assertLess(results[True][1] * 3, results[False][1])
+        self.assertEqual(ai_alpha_beta.last_search_stats["depth"], 3)
+
+
+class TestParallelSearch(unittest.TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        shutdown_pool()
+
+    def test_matches_serial_search(self):
+        board = [["X", " ", " ", " ", " "],
+                 [" ", "O", " ", " ", " "],
+                 [" ", " ", "X", " ", " "],
+                 [" ", " ", " ", " ", " "],
+                 [" ", " ", " ", " ", " "]]
+        clear_tables()
+        serial = get_best_move_alpha_beta(board, "O")
+        self.assertEqual(get_best_move_parallel(board, "O", workers=2), serial)
+        clear_tables()
+        serial = get_best_move_minimax(board, "O")
+        self.assertEqual(get_best_move_parallel(board, "O", engine="minimax", workers=2), serial)
+
+    def test_finds_forced_block(self):
+        board = [[" ", " ", " ", " ", " "],
+                 [" ", " ", " ", " ", " "],
+                 ["X", "X", "X", "X", " "],
+                 [" ", " ", " ", " ", " "],
+                 [" ", " ", " ", " ", " "]]
+        self.assertEqual(get_best_move_parallel(board, "O", workers=2), (2, 4))
+
+    def test_workers_forget_positions_from_earlier_games(self):
+        # The worker task runs in this process here, so its table can be seen
+        saved = parallel_search._shared_best, parallel_search._worker_game
+        parallel_search._init_worker(multiprocessing.Value("d", -float("inf")))
+        board = BitBoard.from_list([["X", " ", " ", " ", " "],
+                                    [" ", "O", " ", " ", " "],
+                                    [" ", " ", "X", " ", " "],
+                                    [" ", " ", " ", " ", " "],
+                                    [" ", " ", " ", " ", " "]])
+        task = ("alpha_beta", board.x, board.o, (5, 5), "O", (1, 2))
+        try:
+            hits = []
+            for game in (tables_game(), tables_game(), tables_game() + 1):
+                parallel_search._shared_best.value = -float("inf")
+                parallel_search._search_root_move(*task, game)
+                hits.append(ai_alpha_beta.last_search_stats["tt_hits"])
+            # Repeating the task reuses the table until the parent starts a new game
+            self.assertGreater(hits[1], 0)
+            self.assertEqual(hits[2], hits[0])
+        finally:
+            parallel_search._shared_best, parallel_search._worker_game = saved
+
+
+class TestPVS(unittest.TestCase):
+
+    def setUp(self):
+        clear_tables()
+
+    def test_pvs_finds_win_and_block(self):
+        board = [[" ", " ", " ", " ", " "],
+                 [" ", " ", " ", " ", " "],
+                 ["O", "O", "O", "O", " "],
+                 [" ", " ", " ", " ", " "],
+                 [" ", " ", " ", " ", " "]]
+        self.assertEqual(get_best_move_pvs(board, "O"), (2, 4))
+        clear_tables()
+        self.assertEqual(get_best_move_pvs(board, "X"), (2, 4))
+
+    def test_pvs_agrees_with_alpha_beta_score(self):
+        board = [["X", " ", " ", " ", " "],
+                 [" ", "O", " ", " ", " "],
+                 [" ", " ", "X", " ", " "],
+                 [" ", " ", " ", "X", " "],
+                 [" ", " ", " ", " ", " "]]
+        self.assertEqual(get_best_move_pvs(board, "O"), get_best_move_alpha_beta(board, "O"))
+        self.assertEqual(ai_pvs.last_search_stats["score"], ai_alpha_beta.last_search_stats["score"])
+        self.assertEqual(ai_pvs.last_search_stats["depth"], 3)
+
+    def test_pvs_searches_fewer_nodes_than_alpha_beta(self):
+        board = [["X", "O", " ", " ", " "],
+                 [" ", "X", " ", " ", " "],
+                 [" ", " ", "O", " ", " "],
+                 [" ", " ", " ", " ", " "],
+                 [" ", " ", " ", " ", " "]]
+        # At the same fixed depth, and with both engines deepening
+        for limits in ({}, {"stop_event": threading.Event()}):
+            clear_tables()
+            get_best_move_alpha_beta(board, "O", **limits)
+            clear_tables()
+            get_best_move_pvs(board, "O", **limits)
+            self.assertEqual(ai_pvs.last_search_stats["depth"], ai_alpha_beta.last_search_stats["depth"])
+            self.assertLess(ai_pvs.last_search_stats["nodes"], ai_alpha_beta.last_search_stats["nodes"])
+
+
+class TestMCTS(unittest.TestCase):
+
+    def test_mcts_finds_win_and_block(self):
+        board = [[" ", " ", " ", " ", " "],
+                 [" ", " ", " ", " ", " "],
+                 ["O", "O", "O", "O", " "],
+                 [" ", " ", " ", " ", " "],
+                 [" ", " ", " ", " ", " "]]
+        self.assertEqual(get_best_move_mcts(board, "O", seed=1), (2, 4))
+        self.assertEqual(get_best_move_mcts(board, "X", seed=1), (2, 4))
+
+    def test_vector_playouts_find_win_and_block(self):
+        board = [[" ", " ", " ", " ", " "],
+                 [" ", " ", " ", " ", " "],
+                 ["O", "O", "O", "O", " "],
+                 [" ", " ", " ", " ", " "],
+                 [" ", " ", " ", " ", " "]]
+        for player in ("O", "X"):
+            move = get_best_move_mcts(board, player, iterations=200, batch=ai_mcts.VECTOR_BATCH, seed=1)
+            self.assertEqual(move, (2, 4))
+            self.assertEqual(ai_mcts.last_search_stats["playouts"] % ai_mcts.VECTOR_BATCH, 0)
+
+    def test_iteration_budget_is_exact(self):
+        board = [[" "] * 5 for _ in range(5)]
+        move = get_best_move_mcts(board, "X", iterations=300, seed=2)
+        self.assertIn(move, get_empty_cells(board))
+        stats = ai_mcts.last_search_stats
+        self.assertEqual(stats["iterations"], 300)
+        self.assertEqual(stats["playouts"], 300 * ai_mcts.PLAYOUT_BATCH)
+        self.assertGreater(stats["iterations_per_sec"], 0)
+
+    def test_time_budget_controls_latency(self):
+        board = [[" "] * 5 for _ in range(5)]
+        get_best_move_mcts(board, "X", time_limit_ms=200, seed=3)
+        self.assertLess(ai_mcts.last_search_stats["elapsed"], 0.3)
+
+
+class TestPlayoutSimulator(unittest.TestCase):
+
+    def test_results_follow_game_rules(self):
+        simulator = PlayoutSimulator(300, seed=4)
+        results = simulator.run()
+        for board, result in zip(simulator.bitboards(), results):
+            if result == X_WINS:
+                self.assertTrue(board.has_won("X"))
+            elif result == O_WINS:
+                self.assertTrue(board.has_won("O"))
+            else:
+                self.assertEqual(result, DRAW)
+                self.assertTrue(board.is_drawn())
+            self.assertIn(bin(board.x).count("1") - bin(board.o).count("1"), (0, 1))
+
+    def test_random_positions_are_undecided(self):
+        boards = random_positions(50, 3, 8, seed=5)
+        self.assertEqual(len(boards), 50)
+        for board in boards:
+            self.assertTrue(3 <= bin(board.x | board.o).count("1") <= 8)
+            self.assertFalse(board.has_won("X") or board.has_won("O"))
+
+    def test_finished_positions_are_not_played(self):
+        full = BitBoard.from_list([["X", "O", "X", "O", "O"],
+                                   ["O", "X", "X", "X", "O"],
+                                   ["X", "O", "O", "X", "O"],
+                                   ["X", "X", "O", "X", "O"],
+                                   ["O", "O", "X", "X", "X"]])
+        won = BitBoard.from_list([["O", "O", "O", "O", "O"],
+                                  ["X", "X", "X", "X", " "],
+                                  [" ", " ", " ", " ", " "],
+                                  [" ", " ", " ", " ", " "],
+                                  [" ", " ", " ", " ", " "]])
+        for board, result in ((full, DRAW), (won, O_WINS)):
+            simulator = PlayoutSimulator(3, board.x, board.o, "X", seed=7)
+            self.assertEqual(simulator.step(), 0)
+            self.assertEqual(list(simulator.result), [result] * 3)
+            self.assertEqual([(b.x, b.o) for b in simulator.bitboards()], [(board.x, board.o)] * 3)
+
+    def test_vector_and_python_playouts_agree(self):
+        # Many dead lines, so playing cells on them would change the games
+        board = BitBoard.from_list([["X", "O", " ", " ", " "],
+                                    ["O", "X", " ", " ", " "],
+                                    [" ", " ", "X", "O", " "],
+                                    [" ", " ", "O", "X", " "],
+                                    [" ", " ", " ", " ", " "]])
+        games = 4000
+        vector = playout_rewards(board.x, board.o, "X", games, seed=8) / games
+        rng = random.Random(8)
+        python = sum(ai_mcts._playout(board.x, board.o, rng) for _ in range(games)) / games
+        self.assertAlmostEqual(vector, python, delta=0.025)
+
+    def test_playout_rewards_from_forced_position(self):
+        # X to move with only (4, 4) left: it blocks O's column and draws
+        board = BitBoard.from_list([["X", "O", "X", "O", "O"],
+                                    ["O", "X", "X", "X", "O"],
+                                    ["X", "O", "O", "X", "O"],
+                                    ["X", "X", "O", "X", "O"],
+                                    ["O", "O", "X", "X", " "]])
+        self.assertEqual(playout_rewards(board.x, board.o, "X", 16, seed=6), 8.0)
+        # Had O been to move, it would win every game
+        self.assertEqual(playout_rewards(board.o, board.x, "O", 16, seed=6), 0.0)
+
+
+class TestBoardRules(unittest.TestCase):
+
+    def setUp(self):
+        # 7x7, four in a row: X threatens to finish row 3 at (3, 3)
+        self.board = BitBoard.empty(7, 4)
+        for col in range(3):
+            self.board.place(3, col, "X")
+        self.board.place(0, 0, "O")
+        self.board.place(6, 6, "O")
+
+    def test_line_tables(self):
+        self.assertIs(get_line_table(5), get_line_table(5, 5))
+        self.assertEqual(get_line_table(5).win_masks, WIN_MASKS)
+        lines = get_line_table(7, 4)
+        # 28 runs each across and down, 16 along each diagonal direction
+        self.assertEqual(len(lines.win_masks), 88)
+        self.assertTrue(all(bin(mask).count("1") == 4 for mask in lines.win_masks))
+        self.assertEqual(len(lines.lines_through_cell[lines.cell_bit(3, 3)]), 16)
+        self.assertEqual(len(lines.lines_through_cell[lines.cell_bit(0, 0)]), 3)
+
+    def test_k_in_a_row_wins(self):
+        board = [[" "] * 7 for _ in range(7)]
+        for i in range(4):
+            board[1 + i][5 - i] = "X"
+        self.assertTrue(check_winner(board, "X", 4))
+        self.assertFalse(check_winner(board, "X", 5))
+        self.assertFalse(check_winner(board, "X"))
+
+        bitboard = BitBoard.from_list(board, 4)
+        self.assertEqual((bitboard.size, bitboard.win_length), (7, 4))
+        self.assertTrue(bitboard.is_winning_move(2, 4))
+        self.assertEqual(bitboard.to_list(), board)
+
+    def test_engines_block_on_larger_board(self):
+        for engine in (get_best_move_alpha_beta, get_best_move_minimax, get_best_move_pvs):
+            self.assertEqual(engine(self.board, "O", node_limit=20000), (3, 3))
+        self.assertEqual(get_best_move_mcts(self.board, "O", iterations=300, seed=1), (3, 3))
+
+    def test_proximity_cuts_nodes_on_sparse_board(self):
+        board = BitBoard.empty(9, 5)
+        board.place(4, 4, "X")
+        board.place(3, 4, "O")
+        board.place(5, 5, "X")
+        nodes = {}
+        for proximity in (0, 1):
+            clear_tables()
+            get_best_move_alpha_beta(board, "O", proximity=proximity)
+            nodes[proximity] = ai_alpha_beta.last_search_stats["nodes"]
+        self.assertLess(nodes[1] * 10, nodes[0])
+
+    def test_playouts_on_larger_board(self):
+        lines = get_line_table(9, 5)
+        simulator = PlayoutSimulator(50, seed=7, lines=lines)
+        results = simulator.run()
+        for board, result in zip(simulator.bitboards(), results):
+            self.assertEqual(board.size, 9)
+            if result == X_WINS:
+                self.assertTrue(board.has_won("X"))
+            elif result == O_WINS:
+                self.assertTrue(board.has_won("O"))
+
+
+class TestEvaluation(unittest.TestCase):
+
+    def test_pattern_tables_cover_every_line_filling(self):
+        self.assertEqual(len(LINE_PATTERNS), 12)
+        self.assertTrue(all(len(table) == 3 ** 5 for _, table in LINE_PATTERNS))
+
+    def test_evaluation_is_symmetric_between_players(self):
+        board = BitBoard.from_list([["X", "X", "X", " ", " "],
+                                    [" ", "O", " ", " ", " "],
+                                    [" ", " ", " ", " ", " "],
+                                    [" ", " ", " ", "O", " "],
+                                    [" ", " ", " ", " ", " "]])
+        self.assertEqual(evaluate(0, 0), 0)
+        self.assertEqual(evaluate(board.x, board.o), -evaluate(board.o, board.x))
+        self.assertGreater(evaluate(board.x, board.o), 0)
+
+    def test_dead_lines_score_nothing(self):
+        row = BitBoard.from_list([["X", "X", "X", "X", "O"]] + [[" "] * 5 for _ in range(4)])
+        only_row = BitBoard.from_list([["X", "X", "X", "X", " "]] + [[" "] * 5 for _ in range(4)])
+        self.assertLess(evaluate(row.x, row.o), evaluate(only_row.x, only_row.o))
+
+    def test_horizon_evaluation_prefers_centre_opening(self):
+        clear_tables()
+        board = [[" "] * 5 for _ in range(5)]
+        self.assertEqual(get_best_move_alpha_beta(board, "O"), (2, 2))
+        self.assertLess(abs(ai_alpha_beta.last_search_stats["score"]), WIN_SCORE // 2)
+
+
+class TestSearchBoard(unittest.TestCase):
+
+    def test_counters_follow_moves(self):
+        position = SearchBoard()
+        moves = [(12, 0), (0, 1), (6, 0), (24, 1), (18, 0)]
+        for index, side in moves:
+            self.assertFalse(position.make_move(1 << index, side))
+        self.assertEqual(position.empty_count, 20)
+        self.assertEqual(position.score, evaluate(*position.bits))
+        self.assertEqual(SearchBoard(*position.bits).counts, position.counts)
+        for index, side in reversed(moves):
+            position.unmake_move(1 << index, side)
+        self.assertEqual(position.score, 0)
+        self.assertEqual(position.bits, [0, 0])
+        self.assertEqual(position.empty_count, 25)
+
+    def test_make_move_reports_completed_line(self):
+        row = BitBoard.from_list([["O", "O", "O", "O", " "]] + [[" "] * 5 for _ in range(4)])
+        position = SearchBoard(row.o, row.x)
+        self.assertTrue(position.make_move(1 << 4, 0))
+        self.assertTrue(position.has_line(0))
+        position.unmake_move(1 << 4, 0)
+        self.assertFalse(position.has_line(0))
+
+    def test_proximity_moves_follow_stones(self):
+        lines = get_line_table(9, 5)
+        position = SearchBoard(lines=lines, proximity=1)
+        self.assertEqual(position.moves(), lines.centre)
+        moves = [(lines.cell_bit(4, 4), 0), (lines.cell_bit(4, 5), 1), (lines.cell_bit(0, 8), 0)]
+        for bit, side in moves:
+            position.make_move(bit, side)
+        # The 3x4 block around the pair less its stones, plus 3 cells by the corner
+        self.assertEqual(bin(position.moves()).count("1"), 10 + 3)
+        self.assertEqual(position.near, SearchBoard(*position.bits, lines, 1).near)
+        for bit, side in reversed(moves):
+            position.unmake_move(bit, side)
+        self.assertEqual(position.near, 0)
+
+
+class TestQuiescence(unittest.TestCase):
+
+    def test_forcing_moves_past_horizon(self):
+        lines = get_line_table(7, 4)
+        x = sum(lines.cell_bit(3, col) for col in (1, 2, 3))
+        o = lines.cell_bit(0, 0)
+        # Side 0 (O) to move faces an open three: two cells to block
+        self.assertEqual(quiescence(SearchBoard(o, x, lines), 4, 0), (6 - WIN_SCORE, 0))
+        # X to move just wins
+        self.assertEqual(quiescence(SearchBoard(o, x, lines), 4, 1), (WIN_SCORE - 5, 0))
+        # With one end blocked, O blocks the other and the position is quiet
+        o |= lines.cell_bit(3, 0)
+        score, blocks = quiescence(SearchBoard(o, x, lines), 4, 0)
+        self.assertEqual(blocks, 1)
+        self.assertLess(abs(score), WIN_SCORE - 1000)
+
+    def test_engines_see_forced_loss_beyond_depth(self):
+        board = BitBoard.empty(7, 4)
+        board.place(3, 2, "X")
+        board.place(3, 3, "X")
+        board.place(0, 0, "O")
+        for module, engine in ((ai_alpha_beta, get_best_move_alpha_beta), (ai_pvs, get_best_move_pvs)):
+            clear_tables()
+            engine(board, "O", quiescence_limit=0)
+            self.assertGreater(module.last_search_stats["score"], 1000 - WIN_SCORE)
+            clear_tables()
+            engine(board, "O")
+            self.assertLess(module.last_search_stats["score"], 1000 - WIN_SCORE)
+            self.assertGreater(module.last_search_stats["qnodes"], 0)
+
+
+class TestLastMoveWin(unittest.TestCase):
+
+    def test_lines_through_cells(self):
+        self.assertEqual(len(LINES_THROUGH_CELL[1 << 12]), 4)
+        self.assertEqual(len(LINES_THROUGH_CELL[1 << 0]), 3)
+        self.assertEqual(len(LINES_THROUGH_CELL[1 << 1]), 2)
+
+    def test_winning_move_only_checks_its_lines(self):
+        board = BitBoard.from_list([["X", " ", " ", " ", "O"],
+                                    [" ", "X", " ", "O", " "],
+                                    [" ", " ", "X", " ", " "],
+                                    [" ", "O", " ", "X", " "],
+                                    ["O", " ", " ", " ", "X"]])
+        self.assertTrue(board.is_winning_move(4, 4))
+        self.assertTrue(board.is_winning_move(2, 2))
+        self.assertFalse(board.is_winning_move(0, 4))
+        self.assertFalse(board.is_winning_move(0, 1))
+        self.assertFalse(completes_line(board.o, 1 << 4))
+
+
+class TestDeadLines(unittest.TestCase):
+
+    def setUp(self):
+        clear_tables()
+        # Every row, column and diagonal already holds both X and O
+        self.drawn = [["O", " ", "O", " ", "X"],
+                      ["X", " ", "X", " ", "O"],
+                      ["O", "X", "X", "X", "X"],
+                      ["X", "O", "O", "O", " "],
+                      [" ", "X", " ", " ", "O"]]
+
+    def test_board_reports_dead_draw_early(self):
+        board = BitBoard.from_list(self.drawn)
+        self.assertTrue(board.is_drawn())
+        self.assertFalse(board.is_full())
+        self.assertFalse(BitBoard().is_drawn())
+
+    def test_live_lines_follow_moves(self):
+        position = SearchBoard()
+        self.assertEqual(position.live_lines, 12)
+        position.make_move(1 << 0, 0)
+        position.make_move(1 << 1, 1)
+        self.assertEqual(position.live_lines, 11)
+        self.assertEqual(position.moves() & 1 << 1, 0)
+        position.unmake_move(1 << 1, 1)
+        self.assertEqual(position.live_lines, 12)
+
+    def test_engines_are_instant_on_dead_draw(self):
+        for engine, module in ((get_best_move_minimax, ai_minimax),
+                               (get_best_move_alpha_beta, ai_alpha_beta),
+                               (get_best_move_pvs, ai_pvs)):
+            move = engine(self.drawn, "O")
+            self.assertIn(move, get_empty_cells(self.drawn))
+            self.assertEqual(module.last_search_stats["score"], 0)
+            self.assertLess(module.last_search_stats["nodes"], 50)
+
+
+class TestPondering(unittest.TestCase):
+
+    def setUp(self):
+        clear_tables()
+        self.board = BitBoard.from_list([["X", "O", " ", " ", " "],
+                                         [" ", "X", " ", " ", " "],
+                                         [" ", " ", "O", " ", " "],
+                                         [" ", " ", " ", " ", " "],
+                                         [" ", " ", " ", " ", " "]])
+
+    def test_stop_event_ends_search_with_a_move(self):
+        stop = threading.Event()
+        stop.set()
+        move = get_best_move_alpha_beta(self.board, "O", time_limit_ms=60000, stop_event=stop)
+        self.assertIn(move, self.board.empty_cells())
+        self.assertLess(ai_alpha_beta.last_search_stats["elapsed"], 1.0)
+
+    def test_stop_event_without_budget_returns_a_move(self):
+        stop = threading.Event()
+        stop.set()
+        for engine, module in ((get_best_move_minimax, ai_minimax),
+                               (get_best_move_alpha_beta, ai_alpha_beta),
+                               (get_best_move_pvs, ai_pvs)):
+            clear_tables()
+            move = engine(self.board, "O", stop_event=stop)
+            self.assertIn(move, self.board.empty_cells())
+            self.assertLess(module.last_search_stats["elapsed"], 1.0)
+
+    def test_unset_stop_event_keeps_fixed_depth(self):
+        get_best_move_alpha_beta(self.board, "O", stop_event=threading.Event())
+        self.assertEqual(ai_alpha_beta.last_search_stats["depth"], ai_alpha_beta.MAX_DEPTH)
+        score = ai_alpha_beta.last_search_stats["score"]
+        clear_tables()
+        get_best_move_alpha_beta(self.board, "O")
+        self.assertEqual(ai_alpha_beta.last_search_stats["score"], score)
+
+    def test_likely_replies_lead_with_predicted_move(self):
+        # A fixed-depth search, so the prediction doesn't depend on timing
+        def engine(board, player, **limits):
+            return get_best_move_alpha_beta(board, player)
+
+        replies = likely_replies(self.board, "X", engine)
+        predicted = get_best_move_alpha_beta(self.board, "X")
+        self.assertEqual(replies[0], predicted)
+        self.assertEqual(sorted(replies), sorted(self.board.empty_cells()))
+
+    def test_take_returns_pondered_answer(self):
+        worker = PonderWorker(self.board, get_best_move_alpha_beta, "Alpha-Beta", time_limit_ms=None)
+        worker.run()  # synchronously, without starting the thread
+        self.assertTrue(worker.results)
+        (x, o), move = next(iter(worker.results.items()))
+        child = BitBoard(x, o)
+        self.assertEqual(bin(child.x).count("1"), bin(self.board.x).count("1") + 1)
+        self.assertIn(move, child.empty_cells())
+        self.assertEqual(worker.take(child), move)
+        self.assertIsNone(worker.take(BitBoard()))
+
+
+class TestAIMoveWorker(unittest.TestCase):
+
+    def setUp(self):
+        clear_tables()
+        self.board = BitBoard.from_list([[" ", " ", " ", " ", " "],
+                                         [" ", " ", " ", " ", " "],
+                                         ["O", "O", "O", "O", " "],
+                                         ["X", "X", "X", " ", " "],
+                                         ["X", " ", " ", " ", " "]])
+
+    def test_progress_reports_each_completed_depth(self):
+        reports = []
+        get_best_move_alpha_beta(BitBoard(1 << 12, 0), "O", node_limit=20000,
+                                 progress=lambda depth, nodes: reports.append((depth, nodes)))
+        self.assertTrue(reports)
+        self.assertEqual([depth for depth, _ in reports], list(range(len(reports))))
+        self.assertEqual([nodes for _, nodes in reports], sorted(nodes for _, nodes in reports))
+
+    def test_worker_emits_move_and_progress(self):
+        moves, reports = [], []
+        worker = AIMoveWorker(self.board, get_best_move_pvs, "PVS", time_limit_ms=500)
+        worker.move_ready.connect(lambda move, name, seconds: moves.append((move, name)))
+        worker.progress.connect(lambda depth, nodes: reports.append(depth))
+        worker.run()  # synchronously, without starting the thread
+        self.assertEqual(moves, [((2, 4), "PVS")])
+        self.assertTrue(reports)
+
+    def test_cancelled_worker_emits_nothing(self):
+        moves = []
+        worker = AIMoveWorker(self.board, get_best_move_alpha_beta, "Alpha-Beta")
+        worker.move_ready.connect(lambda *args: moves.append(args))
+        worker.cancel()
+        worker.run()
+        self.assertEqual(moves, [])
+
+
+class TestOpeningBook(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".bin")
+        os.close(handle)
+        self.entries = build_book(max_plies=2, node_limit=300)
+        write_book(self.entries, self.path, max_plies=2)
+        self.book = OpeningBook(self.path)
+
+    def tearDown(self):
+        self.book.close()
+        os.remove(self.path)
+
+    def test_positions_are_canonical_and_unique(self):
+        positions = list(canonical_positions(2))
+        self.assertEqual(len(positions), len(set(positions)))
+        self.assertEqual(len(positions), 1 + 6 + 85)
+        for x, o in positions:
+            self.assertEqual(canonical_form(x, o)[:2], (x, o))
+
+    def test_lookup_returns_stored_move_in_every_orientation(self):
+        x, o = 1 << 0, 1 << 7
+        index = self.entries[pack_position(x, o)]
+        for t in range(8):
+            tx, to = transform_bits(x, t), transform_bits(o, t)
+            expected = transform_cell(*divmod(index, 5), t)
+            self.assertEqual(self.book.lookup(tx, to), expected)
+            self.assertEqual(BitBoard(tx, to).get(*expected), " ")
+
+    def test_positions_outside_book_miss(self):
+        board = BitBoard.from_list([["X", "O", "X", " ", " "],
+                                    [" ", " ", " ", " ", " "],
+                                    [" ", " ", " ", " ", " "],
+                                    [" ", " ", " ", " ", " "],
+                                    [" ", " ", " ", " ", " "]])
+        self.assertIsNone(self.book.lookup(board.x, board.o))
+
+    def test_rejects_other_files(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not a book")
+        with self.assertRaises(ValueError):
+            OpeningBook(self.path)
+
+    def test_damaged_book_is_skipped(self):
+        with open(self.path, "rb") as f:
+            data = f.read()
+        default_path = opening_book.BOOK_PATH
+        opening_book.BOOK_PATH = self.path
+        try:
+            for length in (4, len(data) - 100):
+                with open(self.path, "wb") as f:
+                    f.write(data[:length])
+                with self.assertRaises(ValueError):
+                    OpeningBook(self.path)
+                opening_book._book, opening_book._book_checked = None, False
+                self.assertIsNone(opening_book.get_book())
+        finally:
+            opening_book.BOOK_PATH = default_path
+            opening_book._book, opening_book._book_checked = None, False
+
+    def test_book_engine_falls_back_to_search(self):
+        board = [[" ", " ", " ", " ", " "],
+                 [" ", " ", " ", " ", " "],
+                 ["O", "O", "O", "O", " "],
+                 ["X", "X", "X", " ", " "],
+                 ["X", " ", " ", " ", " "]]
+        self.assertEqual(opening_book.get_best_move_book(board, "O", time_limit_ms=500), (2, 4))
+
+
+class TestTablebase(unittest.TestCase):
+
+    def setUp(self):
+        clear_tables()
+        handle, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        self.default_path = tablebase.TABLEBASE_PATH
+        tablebase.use_table(self.path)
+        tablebase.clear()
+        # O to move can win at (3, 4); X threatens (0, 4)
+        self.board = BitBoard.from_list([["X", "X", "X", "X", " "],
+                                         ["O", "X", "O", "O", "X"],
+                                         ["X", "O", "X", "O", " "],
+                                         ["O", "O", "O", "O", " "],
+                                         ["X", "O", "X", "X", " "]])
+
+    def tearDown(self):
+        tablebase.clear()
+        tablebase.use_table(self.default_path)
+        os.remove(self.path)
+
+    def negamax(self, mover, waiting):
+        if not live_cells(mover, waiting):
+            return 0
+        best = -1
+        for bit in iter_bits(~(mover | waiting) & FULL_MASK):
+            if completes_line(mover | bit, bit):
+                return 1
+            best = max(best, -self.negamax(waiting, mover | bit))
+        return best
+
+    def test_solve_matches_plain_negamax(self):
+        positions = [(self.board.o, self.board.x), (self.board.x, self.board.o),
+                     (self.board.o | 1 << 4, self.board.x | 1 << 19)]
+        for mover, waiting in positions:
+            result, distance = tablebase.solve(mover, waiting)
+            self.assertEqual(result, self.negamax(mover, waiting))
+
+    def test_engines_play_solved_moves_without_searching(self):
+        for engine, module in ((get_best_move_minimax, ai_minimax),
+                               (get_best_move_alpha_beta, ai_alpha_beta),
+                               (get_best_move_pvs, ai_pvs)):
+            self.assertEqual(engine(self.board, "O", time_limit_ms=1000), (3, 4))
+            self.assertEqual(module.last_search_stats["nodes"], 0)
+            self.assertEqual(module.last_search_stats["score"], WIN_SCORE)
+
+    def test_solved_positions_are_kept_on_disk(self):
+        move, entry = tablebase.solved_move(self.board.o, self.board.x)
+        self.assertEqual((move, entry), ((3, 4), (tablebase.WIN, 1)))
+        tablebase.clear()
+        with sqlite3.connect(self.path) as connection:
+            stored = connection.execute("SELECT result, distance FROM tablebase WHERE position = ?",
+                                        (tablebase.position_key(self.board.o, self.board.x),)).fetchone()
+        self.assertEqual(stored, (tablebase.WIN, 1))
+        self.assertEqual(tablebase.solved_move(self.board.o, self.board.x), (move, entry))
+
+    def test_probe_score_uses_engine_win_scores(self):
+        tablebase.solve(self.board.o, self.board.x)
+        self.assertEqual(tablebase.probe_score(self.board.o, self.board.x, 2), WIN_SCORE - 3)
+
+
+
+class TestDatabase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.default_path = database.DB_PATH
+        database.use_database(os.path.join(self.directory.name, "games.db"))
+
+    def tearDown(self):
+        database.use_database(self.default_path)
+        self.directory.cleanup()
+
+    def test_import_leaves_database_alone(self):
+        # A fresh interpreter in an empty directory, where the default relative DB_PATH points
+        repo = os.path.dirname(os.path.abspath(__file__))
+        subprocess.run([sys.executable, "-c", f"import sys; sys.path.insert(0, {repo!r}); import database"],
+                       cwd=self.directory.name, check=True, capture_output=True)
+        self.assertFalse(os.path.exists(os.path.join(self.directory.name, "tic_tac_toe.db")))
+
+    def test_one_connection_per_thread(self):
+        conn = database.get_db_connection()
+        self.assertIs(database.get_db_connection(), conn)
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        other = []
+        thread = threading.Thread(target=lambda: other.append(database.get_db_connection()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(other[0], conn)
+        database.close_connections()
+        self.assertIsNot(database.get_db_connection(), conn)
+
+    def test_moves_and_results_are_saved(self):
+        database.start_new_game("alice", "PVS")
+        for _ in range(3):
+            database.save_move_time("alice", "PVS", 0.25)
+        database.save_result("alice", "Win")
+        database.flush_writes()
+        conn = database.get_db_connection()
+        self.assertEqual(conn.execute("SELECT COUNT(*), SUM(move_time) FROM ai_timings").fetchone(), (3, 0.75))
+        self.assertEqual(conn.execute("SELECT result FROM results").fetchall(), [("Win",)])
+
+    def test_writes_are_batched_behind_the_game(self):
+        game_id = database.start_new_game("bob", "MCTS")
+        player_id = database.current_player_id
+        queue = database.WriteBehindQueue(batch_size=1000, interval=60)
+        for move_number in range(50):
+            queue.put("INSERT INTO ai_timings (player_id, algorithm_id, move_time, move_number, game_id) "
+                      "VALUES (?, ?, ?, ?, ?)", (player_id, 4, 0.1, move_number, game_id))
+        self.assertEqual(queue.depth(), 50)
+        self.assertEqual(queue.flushes, 0)
+        queue.flush()
+        self.assertEqual((queue.depth(), queue.flushes, queue.rows_written), (0, 1, 50))
+        self.assertIsNotNone(queue.last_flush_latency)
+        queue.close()
+        # Once closed, rows are written by the caller
+        queue.put("INSERT INTO results (player_id, result) VALUES (?, ?)", (player_id, "Draw"))
+        self.assertEqual(queue.rows_written, 51)
+        conn = database.get_db_connection()
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM ai_timings").fetchone()[0], 50)
+
+    def test_each_game_gets_its_own_id(self):
+        first = database.start_new_game("alice", "PVS")
+        database.save_move_time("alice", "PVS", 0.5)
+        database.save_result("alice", "Loss")
+        second = database.start_new_game("alice", "MCTS")
+        database.save_move_time("alice", "MCTS", 0.5)
+        database.save_move_time("alice", "MCTS", 0.5)
+        database.save_result("alice", "Draw")
+        self.assertNotEqual(first, second)
+        history = database.get_game_history()
+        self.assertEqual([(game_id, result, moves) for game_id, _, result, _, moves in history],
+                         [(first, "Loss", 1), (second, "Draw", 2)])
+        conn = database.get_db_connection()
+        self.assertEqual(conn.execute("SELECT result FROM games WHERE ended_at IS NOT NULL ORDER BY game_id").fetchall(),
+                         [("Loss",), ("Draw",)])
+
+    def test_old_database_is_migrated(self):
+        path = os.path.join(self.directory.name, "old.db")
+        old = sqlite3.connect(path)
+        old.executescript("""
+            CREATE TABLE players (player_id INTEGER PRIMARY KEY, player_name TEXT NOT NULL UNIQUE,
+                                  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+            CREATE TABLE ai_algorithms (algorithm_id INTEGER PRIMARY KEY, algorithm_name TEXT NOT NULL UNIQUE);
+            CREATE TABLE results (result_id INTEGER PRIMARY KEY, player_id INTEGER NOT NULL,
+                                  result TEXT CHECK(result IN ('Win', 'Loss', 'Draw')),
+                                  game_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+            CREATE TABLE ai_timings (timing_id INTEGER PRIMARY KEY, player_id INTEGER NOT NULL,
+                                     algorithm_id INTEGER NOT NULL, move_time REAL NOT NULL,
+                                     move_number INTEGER NOT NULL, game_id INTEGER NOT NULL,
+                                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+            INSERT INTO players VALUES (1, 'alice', '2025-01-01 10:00:00');
+            INSERT INTO ai_algorithms VALUES (1, 'Minimax');
+            INSERT INTO ai_timings VALUES (1, 1, 1, 0.5, 1, 1, '2025-01-01 10:00:10');
+            INSERT INTO ai_timings VALUES (2, 1, 1, 0.5, 2, 1, '2025-01-01 10:00:20');
+            INSERT INTO ai_timings VALUES (3, 1, 1, 0.5, 1, 2, '2025-01-01 11:00:10');
+            INSERT INTO results VALUES (1, 1, 'Win', '2025-01-01 10:00:30');
+            INSERT INTO results VALUES (2, 1, 'Loss', '2025-01-01 11:00:30');
+            INSERT INTO results VALUES (3, 1, 'Draw', '2025-01-01 12:00:00');
+        """)
+        old.close()
+        database.use_database(path)
+        self.assertEqual([(game_id, result, moves) for game_id, _, result, _, moves in database.get_game_history()],
+                         [(1, "Win", 2), (2, "Loss", 1), (3, "Draw", 0)])
+        conn = database.get_db_connection()
+        self.assertEqual(conn.execute("PRAGMA foreign_key_check").fetchall(), [])
+        self.assertEqual(conn.execute("PRAGMA user_version").fetchone()[0], database.SCHEMA_VERSION)
+        # New games never reuse an id from before the migration
+        self.assertEqual(database.start_new_game("alice", "PVS"), 4)
+
+    def test_migrations_apply_once(self):
+        conn = database.get_db_connection()
+        self.assertEqual(conn.execute("PRAGMA user_version").fetchone()[0], database.SCHEMA_VERSION)
+        self.assertEqual(database.migrate(conn), [])
+        conn.execute("PRAGMA user_version = 2")
+        self.assertEqual(database.migrate(conn), [3])
+
+    def test_known_names_need_no_lookup_queries(self):
+        database.start_new_game("alice", "PVS")
+        database.save_result("alice", "Win")
+        statements = []
+        database.get_db_connection().set_trace_callback(statements.append)
+        database.start_new_game("alice", "PVS")
+        database.save_move_time("alice", "PVS", 0.5)
+        database.save_result("alice", "Loss")
+        database.get_db_connection().set_trace_callback(None)
+        self.assertEqual([sql for sql in statements if "FROM players" in sql or "FROM ai_algorithms" in sql], [])
+
+    def test_id_cache_drops_least_recently_used(self):
+        cache = database.IdCache(max_size=2)
+        cache.put("alice", 1)
+        cache.put("bob", 2)
+        cache.get("alice")
+        cache.put("carol", 3)
+        self.assertEqual((cache.get("alice"), cache.get("bob"), cache.get("carol")), (1, None, 3))
+        self.assertEqual(len(cache), 2)
+
+    def test_unknown_algorithm_is_not_cached(self):
+        self.assertEqual(database.get_algorithm_id("Negamax"), 1)
+        with database.get_db_connection() as conn:
+            conn.execute("INSERT INTO ai_algorithms (algorithm_id, algorithm_name) VALUES (5, 'Negamax')")
+        self.assertEqual(database.get_algorithm_id("Negamax"), 5)
+
+    def test_hot_queries_use_indexes(self):
+        conn = database.get_db_connection()
+
+        def plan(query, *params):
+            return " | ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + query, params))
+
+        self.assertIn("INDEX idx_ai_timings_game (game_id=?)", plan(database.GAME_HISTORY_QUERY))
+        chart = plan(database.PERFORMANCE_QUERY, 20)
+        self.assertIn("INDEX idx_ai_timings_game", chart)
+        self.assertNotIn("FOR GROUP BY", chart)
+        self.assertIn("INDEX idx_ai_timings_algorithm", plan(
+            "SELECT AVG(move_time) FROM ai_timings WHERE algorithm_id = ? AND created_at >= ?", 4, "2025-01-01"))
+        self.assertIn("INDEX idx_results_player", plan(
+            "SELECT result FROM results WHERE player_id = ? ORDER BY game_date DESC", 1))
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
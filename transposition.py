@@ -0,0 +1,155 @@
+# transposition.py
+import random
+from utils import DEFAULT_LINES, iter_bits
+from evaluation import WIN_THRESHOLD
+
+# Bound types stored with each entry
+EXACT = 0
+LOWER = 1
+UPPER = 2
+_FLIPPED = {EXACT: EXACT, LOWER: UPPER, UPPER: LOWER}
+
+DEFAULT_MAX_ENTRIES = 200_000
+
+# Cells with Zobrist keys, enough for boards up to 16x16
+MAX_CELLS = 256
+
+# Fixed seed so hashes are reproducible between runs. Keys for the first
+# 25 cells are drawn first, so 5x5 hashes match older versions.
+_rng = random.Random(0x5A0B)
+_x_keys = [_rng.getrandbits(64) for _ in range(25)]
+_o_keys = [_rng.getrandbits(64) for _ in range(25)]
+ZOBRIST_SIDE = _rng.getrandbits(64)
+_x_keys += [_rng.getrandbits(64) for _ in range(MAX_CELLS - 25)]
+_o_keys += [_rng.getrandbits(64) for _ in range(MAX_CELLS - 25)]
+ZOBRIST_X = {1 << i: key for i, key in enumerate(_x_keys)}
+ZOBRIST_O = {1 << i: key for i, key in enumerate(_o_keys)}
+
+# Per-rules key mixed into every hash, so positions with the same stones
+# under different rules never share a table entry
+_rule_keys = {(DEFAULT_LINES.size, DEFAULT_LINES.win_length): 0}
+
+
+def piece_keys(player):
+    """Zobrist keys indexed by single-bit cell mask for the given player"""
+    return ZOBRIST_X if player == "X" else ZOBRIST_O
+
+
+def rule_key(lines):
+    """Hash component for the board size and win length of lines"""
+    rules = (lines.size, lines.win_length)
+    key = _rule_keys.get(rules)
+    if key is None:
+        key = _rule_keys[rules] = random.Random(hash(rules)).getrandbits(64)
+    return key
+
+
+def zobrist_hash(x_bits, o_bits, to_move, lines=DEFAULT_LINES):
+    """Full hash of a position; searches update it incrementally per move"""
+    key = rule_key(lines)
+    if to_move == "O":
+        key ^= ZOBRIST_SIDE
+    for bit in iter_bits(x_bits):
+        key ^= ZOBRIST_X[bit]
+    for bit in iter_bits(o_bits):
+        key ^= ZOBRIST_O[bit]
+    return key
+
+
+class TranspositionTable:
+    """
+    Bounded position cache keyed by Zobrist hash.
+    Values are stored from the point of view of the side to move, so callers
+    searching for the other side pass sign=-1 and get bounds flipped for them.
+
+    Win/loss scores depend on how far the win is from the root, so they are
+    stored relative to the node (pass its ply) and converted back on probe.
+
+    Replacement: an existing entry is only overwritten by a search at least as
+    deep, unless it was written during an earlier search (generation).
+    Eviction: when full, the oldest written entry is dropped.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.generation = 0
+        self._entries = {}
+        self.probes = 0
+        self.hits = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def new_search(self):
+        """Mark the start of a root search so older entries age out first"""
+        self.generation += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+        self.evictions = 0
+
+    def probe(self, key, sign=1, ply=0):
+        """Return (depth, value, flag, move) for key, or None"""
+        self.probes += 1
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self.hits += 1
+        depth, value, flag, move, _ = entry
+        if value >= WIN_THRESHOLD:
+            value -= ply
+        elif value <= -WIN_THRESHOLD:
+            value += ply
+        if sign < 0:
+            return depth, -value, _FLIPPED[flag], move
+        return depth, value, flag, move
+
+    def store(self, key, depth, value, flag, move=None, sign=1, ply=0):
+        if value >= WIN_THRESHOLD:
+            value += ply
+        elif value <= -WIN_THRESHOLD:
+            value -= ply
+        if sign < 0:
+            value = -value
+            flag = _FLIPPED[flag]
+
+        old = self._entries.get(key)
+        if old is not None:
+            if old[0] > depth and old[4] == self.generation:
+                return
+            del self._entries[key]
+        elif len(self._entries) >= self.max_entries:
+            del self._entries[next(iter(self._entries))]
+            self.evictions += 1
+
+        self._entries[key] = (depth, value, flag, move, self.generation)
+
+
+# One table per engine, kept for the length of a game
+_tables = {}
+# Bumped by clear_tables, so worker processes can tell a new game has started
+_games = 0
+
+
+def get_table(name):
+    """Get the shared table for an engine, creating it on first use"""
+    if name not in _tables:
+        _tables[name] = TranspositionTable()
+    return _tables[name]
+
+
+def clear_tables():
+    """Forget all cached positions; call when a new game starts"""
+    global _games
+    _games += 1
+    for table in _tables.values():
+        table.clear()
+
+
+def tables_game():
+    """Number of clear_tables calls so far; tables filled under another number are stale"""
+    return _games
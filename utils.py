@@ -1,6 +1,286 @@
 # utils.py
 
+BOARD_SIZE = 5
+CELL_COUNT = BOARD_SIZE * BOARD_SIZE
+FULL_MASK = (1 << CELL_COUNT) - 1
+# Largest board the game loops offer; the Zobrist keys cover up to 16x16
+MAX_BOARD_SIZE = 15
+
+# Directions a winning line can run in: right, down, down-right, down-left
+_DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+def cell_bit(row, col, size=BOARD_SIZE):
+    """Bit for a cell, laid out row-major from the least significant bit"""
+    return 1 << (row * size + col)
+
+
+def bit_to_cell(bit, size=BOARD_SIZE):
+    """(row, col) of a single-bit mask"""
+    return divmod(bit.bit_length() - 1, size)
+
+
+class LineTable:
+    """
+    Winning lines of a size x size board where win_length stones in a row,
+    column or diagonal win. Built once per (size, win_length) by
+    get_line_table, so checking a move only looks at the lines through it.
+    """
+
+    def __init__(self, size, win_length):
+        if not 2 <= win_length <= size:
+            raise ValueError(f"Win length must be between 2 and {size}")
+        self.size = size
+        self.win_length = win_length
+        self.cell_count = size * size
+        self.full_mask = (1 << self.cell_count) - 1
+
+        # Every run of win_length cells, grouped by direction: rows first,
+        # then columns, then both diagonals
+        masks = []
+        for d_row, d_col in _DIRECTIONS:
+            for row in range(size):
+                for col in range(size):
+                    end_row = row + d_row * (win_length - 1)
+                    end_col = col + d_col * (win_length - 1)
+                    if 0 <= end_row < size and 0 <= end_col < size:
+                        masks.append(sum(cell_bit(row + d_row * i, col + d_col * i, size)
+                                         for i in range(win_length)))
+        self.win_masks = tuple(masks)
+
+        # Lines through each cell, keyed by the cell's single-bit mask, as
+        # masks and as indices into win_masks
+        self.line_indices = {1 << i: tuple(n for n, line in enumerate(masks) if line >> i & 1)
+                             for i in range(self.cell_count)}
+        self.lines_through_cell = {bit: tuple(masks[n] for n in indices)
+                                   for bit, indices in self.line_indices.items()}
+        self._neighbours = {}
+
+        # The middle cell, or the middle four on an even board
+        low, high = (size - 1) // 2, size // 2
+        self.centre = sum(cell_bit(row, col, size) for row in {low, high} for col in {low, high})
+
+    def cell_bit(self, row, col):
+        return 1 << (row * self.size + col)
+
+    def bit_to_cell(self, bit):
+        return divmod(bit.bit_length() - 1, self.size)
+
+    def neighbours(self, distance):
+        """
+        For each cell, the cells at most distance rows and columns away
+        (including itself) as single-bit masks. Built once per distance.
+        """
+        table = self._neighbours.get(distance)
+        if table is None:
+            table = {}
+            for index in range(self.cell_count):
+                row, col = divmod(index, self.size)
+                table[1 << index] = tuple(
+                    self.cell_bit(r, c)
+                    for r in range(max(0, row - distance), min(self.size, row + distance + 1))
+                    for c in range(max(0, col - distance), min(self.size, col + distance + 1)))
+            self._neighbours[distance] = table
+        return table
+
+    def has_winning_line(self, bits):
+        for line in self.win_masks:
+            if bits & line == line:
+                return True
+        return False
+
+    def completes_line(self, bits, bit):
+        """True if the stone on bit is part of a complete line in bits"""
+        for line in self.lines_through_cell[bit]:
+            if bits & line == line:
+                return True
+        return False
+
+    def live_cells(self, x_bits, o_bits):
+        """Cells on lines that hold stones of at most one player, i.e. can still be won"""
+        cells = 0
+        for line in self.win_masks:
+            if not (x_bits & line and o_bits & line):
+                cells |= line
+        return cells
+
+
+_line_tables = {}
+
+
+def get_line_table(size=BOARD_SIZE, win_length=None):
+    """The shared LineTable for the rules; win_length defaults to a full row"""
+    if win_length is None:
+        win_length = size
+    key = (size, win_length)
+    table = _line_tables.get(key)
+    if table is None:
+        table = _line_tables[key] = LineTable(size, win_length)
+    return table
+
+
+# The standard 5x5, five-in-a-row game used unless other rules are asked for
+DEFAULT_LINES = get_line_table()
+
+# The 12 winning lines of the 5x5 board: 5 rows, 5 columns and 2 diagonals
+WIN_MASKS = DEFAULT_LINES.win_masks
+
+
+# Winning lines through each cell, keyed by the cell's single-bit mask.
+# A move can only complete one of these, so checking them is enough.
+LINES_THROUGH_CELL = DEFAULT_LINES.lines_through_cell
+
+
+def iter_bits(mask):
+    """Yield each set bit of mask as a single-bit mask, lowest first"""
+    while mask:
+        low = mask & -mask
+        yield low
+        mask ^= low
+
+
+def has_winning_line(bits):
+    """True if the given player bits cover any complete winning line"""
+    for line in WIN_MASKS:
+        if bits & line == line:
+            return True
+    return False
+
+
+def completes_line(bits, bit):
+    """True if the stone on bit is part of a complete line in bits"""
+    for line in LINES_THROUGH_CELL[bit]:
+        if bits & line == line:
+            return True
+    return False
+
+
+def live_cells(x_bits, o_bits):
+    """Cells on lines that hold stones of at most one player, i.e. can still be won"""
+    cells = 0
+    for line in WIN_MASKS:
+        if not (x_bits & line and o_bits & line):
+            cells |= line
+    return cells
+
+
+class BitBoard:
+    """
+    Square board stored as one integer per player, 5x5 with five in a row
+    unless other rules are given. Bit (row * size + col) is set when that
+    player occupies the cell; lines is the LineTable for the rules.
+    """
+
+    __slots__ = ("x", "o", "lines")
+
+    def __init__(self, x=0, o=0, lines=DEFAULT_LINES):
+        self.x = x
+        self.o = o
+        self.lines = lines
+
+    @classmethod
+    def empty(cls, size=BOARD_SIZE, win_length=None):
+        """An empty board for the given rules"""
+        return cls(lines=get_line_table(size, win_length))
+
+    @property
+    def size(self):
+        return self.lines.size
+
+    @property
+    def win_length(self):
+        return self.lines.win_length
+
+    @classmethod
+    def from_list(cls, board, win_length=None):
+        """
+        Build a BitBoard from the list-of-lists format used by the game.
+        Without win_length a line has to fill a whole row, as in check_winner.
+        """
+        lines = get_line_table(len(board), win_length)
+        x = o = 0
+        for row in range(lines.size):
+            for col in range(lines.size):
+                if board[row][col] == "X":
+                    x |= lines.cell_bit(row, col)
+                elif board[row][col] == "O":
+                    o |= lines.cell_bit(row, col)
+        return cls(x, o, lines)
+
+    def to_list(self):
+        """Convert back to the list-of-lists format"""
+        size = self.lines.size
+        board = [[" "] * size for _ in range(size)]
+        for bit in iter_bits(self.x):
+            row, col = self.lines.bit_to_cell(bit)
+            board[row][col] = "X"
+        for bit in iter_bits(self.o):
+            row, col = self.lines.bit_to_cell(bit)
+            board[row][col] = "O"
+        return board
+
+    def copy(self):
+        return BitBoard(self.x, self.o, self.lines)
+
+    def bits(self, player):
+        return self.x if player == "X" else self.o
+
+    def empty_mask(self):
+        return self.lines.full_mask & ~(self.x | self.o)
+
+    def get(self, row, col):
+        bit = self.lines.cell_bit(row, col)
+        if self.x & bit:
+            return "X"
+        if self.o & bit:
+            return "O"
+        return " "
+
+    def place(self, row, col, player):
+        if player == "X":
+            self.x |= self.lines.cell_bit(row, col)
+        else:
+            self.o |= self.lines.cell_bit(row, col)
+
+    def clear(self, row, col):
+        mask = ~self.lines.cell_bit(row, col)
+        self.x &= mask
+        self.o &= mask
+
+    def has_won(self, player):
+        return self.lines.has_winning_line(self.bits(player))
+
+    def is_winning_move(self, row, col):
+        """True if the stone at (row, col) completes a line; only lines through it are checked"""
+        bit = self.lines.cell_bit(row, col)
+        if self.x & bit:
+            return self.lines.completes_line(self.x, bit)
+        if self.o & bit:
+            return self.lines.completes_line(self.o, bit)
+        return False
+
+    def is_drawn(self):
+        """True once every line holds both players' stones; covers a full board"""
+        return not self.lines.live_cells(self.x, self.o)
+
+    def empty_cells(self):
+        return [self.lines.bit_to_cell(bit) for bit in iter_bits(self.empty_mask())]
+
+    def is_full(self):
+        return not self.empty_mask()
+
+
+def to_bitboard(board):
+    """Accept either board format and return a BitBoard"""
+    if isinstance(board, BitBoard):
+        return board
+    return BitBoard.from_list(board)
+
+
 def get_empty_cells(board):
+    if isinstance(board, BitBoard):
+        return board.empty_cells()
+
     empty_cells = []
     for row in range(len(board)):
         for col in range(len(board[row])):
@@ -8,20 +288,14 @@ def get_empty_cells(board):
                 empty_cells.append((row, col))
     return empty_cells
 
-def check_winner(board, player):
-    size = len(board)
-
-    # Check rows and columns
-    for i in range(size):
-        if all(cell == player for cell in board[i]):
-            return True
-        if all(board[j][i] == player for j in range(size)):
-            return True
-
-    # Check diagonals
-    if all(board[i][i] == player for i in range(size)):
-        return True
-    if all(board[i][size - i - 1] == player for i in range(size)):
-        return True
-
-    return False
+def check_winner(board, player, win_length=None):
+    """
+    True if player has win_length stones in a row, column or diagonal.
+    Without win_length, list boards need a whole row (the classic rule) and
+    BitBoards use their own rules.
+    """
+    if not isinstance(board, BitBoard):
+        board = BitBoard.from_list(board, win_length)
+    elif win_length is not None and win_length != board.win_length:
+        board = BitBoard(board.x, board.o, get_line_table(board.size, win_length))
+    return board.has_won(player)